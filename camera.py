@@ -5,9 +5,24 @@ Provides live preview and frame capture functionality.
 
 import cv2
 import os
+import sys
+import numpy as np
 from pathlib import Path
 
 
+_BANNER_HEIGHT = 40
+_BANNER_TEXT = "Press SPACE to capture | Q to cancel"
+
+
+# On Windows cv2.waitKey(1) sleeps a full timer tick (~15 ms);
+# pollKey returns immediately while still pumping GUI events.
+if sys.platform == "win32" and hasattr(cv2, "pollKey"):
+    _poll_key = cv2.pollKey
+else:
+    def _poll_key():
+        return cv2.waitKey(1)
+
+
 class CameraCapture:
     """Handles camera initialization, preview, and image capture."""
     
@@ -22,6 +37,24 @@ class CameraCapture:
         self.cap = None
         self.frame_width = 1280
         self.frame_height = 720
+        self._preview_buf = None  # Reused as the decode target for preview frames
+        self._banner = None
+        self._build_banner(self.frame_width)
+    
+    def _build_banner(self, width):
+        """
+        Render the instructions banner once for the given frame width.
+        
+        The preview loop only slice-assigns this array into each frame,
+        so no text is rasterized per frame.
+        
+        Args:
+            width (int): Width of the preview frames in pixels
+        """
+        banner = np.zeros((_BANNER_HEIGHT, width, 3), dtype=np.uint8)
+        cv2.putText(banner, _BANNER_TEXT,
+                    (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+        self._banner = banner
         
     def initialize(self):
         """
@@ -31,16 +64,10 @@ class CameraCapture:
             bool: True if initialization successful, False otherwise
         """
         try:
-            self.cap = cv2.VideoCapture(self.camera_id)
-            
-            if not self.cap.isOpened():
+            if not self._open():
                 print("❌ ERROR: Cannot open camera. Check if camera is connected and not in use.")
                 return False
             
-            # Set camera resolution
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.frame_width)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.frame_height)
-            
             print("✓ Camera initialized successfully")
             return True
             
@@ -48,6 +75,56 @@ class CameraCapture:
             print(f"❌ ERROR initializing camera: {e}")
             return False
     
+    def _open(self):
+        """
+        Open the camera device and apply capture settings.
+        
+        Returns:
+            bool: True if the device is open
+        """
+        self.cap = cv2.VideoCapture(self.camera_id)
+        
+        if not self.cap.isOpened():
+            return False
+        
+        # Keep only the newest frame in the driver queue so reads are not stale
+        # (set before the resolution - some V4L2 drivers ignore it afterwards)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        
+        # Set camera resolution
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.frame_width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.frame_height)
+        
+        # The driver may not support the requested width - match what it delivers
+        actual_width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        if actual_width > 0 and actual_width != self._banner.shape[1]:
+            self._build_banner(actual_width)
+        return True
+    
+    def _warmup(self, frames=1):
+        """
+        Discard frames buffered since the device was opened.
+        
+        Args:
+            frames (int): Number of frames to drop
+        """
+        for _ in range(frames):
+            self.cap.grab()
+    
+    def _grab_fresh(self):
+        """
+        Capture a just-exposed frame, skipping anything left in the driver queue.
+        
+        The first grab() pulls the buffered (stale) frame, the second forces
+        a new sensor readout, and retrieve() decodes it.
+        
+        Returns:
+            tuple: (ret, frame) as returned by VideoCapture.retrieve()
+        """
+        if not (self.cap.grab() and self.cap.grab()):
+            return False, None
+        return self.cap.retrieve()
+    
     def capture_frame(self):
         """
         Capture a single frame from camera with live preview.
@@ -68,25 +145,50 @@ class CameraCapture:
             print("  • Press Q or ESC to cancel")
             print("="*60 + "\n")
             
+            # Drop startup frames queued since initialize()
+            self._warmup()
+            
+            last_signature = None
+            
             while True:
-                ret, frame = self.cap.read()
+                # Decode into the same buffer every iteration instead of allocating
+                # a new full-size frame (the preview frame is never handed out)
+                ret, frame = self.cap.read(self._preview_buf)
                 
                 if not ret:
                     print("❌ ERROR: Failed to capture frame from camera")
                     return None
+                self._preview_buf = frame
                 
-                # Add instructions overlay
-                overlay_frame = frame.copy()
-                cv2.putText(overlay_frame, "Press SPACE to capture | Q to cancel", 
-                           (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-                
-                cv2.imshow("Document Scanner - Camera", overlay_frame)
+                # Some backends hand back the same image when the loop outpaces the
+                # camera; a sparse pixel sample below the banner detects that cheaply
+                signature = frame[_BANNER_HEIGHT::64, ::64].tobytes()
+                if signature != last_signature:
+                    last_signature = signature
+                    
+                    # Add instructions overlay (drawn straight into the preview frame)
+                    if self._banner.shape[1] != frame.shape[1]:
+                        self._build_banner(frame.shape[1])
+                    frame[:_BANNER_HEIGHT] = self._banner
+                    
+                    cv2.imshow("Document Scanner - Camera", frame)
                 
-                # Wait for key press (1 ms timeout)
-                key = cv2.waitKey(1) & 0xFF
+                # Poll for key press (-1 means no key)
+                key = _poll_key()
+                if key == -1:
+                    continue
+                key &= 0xFF
                 
                 if key == ord(' '):  # Space to capture
+                    # The previewed frame has the banner painted on it and may
+                    # already be a frame old - capture a fresh one instead
+                    ret, frame = self._grab_fresh()
                     cv2.destroyAllWindows()
+                    
+                    if not ret:
+                        print("❌ ERROR: Failed to capture frame from camera")
+                        return None
+                    
                     print("✓ Frame captured successfully")
                     return frame
                     
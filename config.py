@@ -18,3 +18,9 @@ ADAPTIVE_THRESHOLD_CONSTANT = 2
 # ===== POSITIONING THRESHOLDS =====
 POSITION_THRESHOLD = 15             # Pixels - same line if within this
 MIN_HORIZONTAL_GAP = 120            # Min gap between label and value
+
+# ===== OCR ENGINE =====
+OCR_DEVICE = "auto"                 # "auto" (use CUDA if available), "cuda" or "cpu"
+OCR_WORKERS = os.cpu_count() or 1   # Threads for parallel per-ROI OCR
+OCR_QUANTIZE = True                 # int8 CPU models (EasyOCR's own default); False forces float models
+OCR_MAX_SIDE = 1280                 # Downscale full pages so the long side is at most this (px)
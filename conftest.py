@@ -0,0 +1,99 @@
+"""
+Shared pytest fixtures
+Each pipeline component is built once per test session and reused by
+every test that asks for it
+"""
+
+import importlib.util
+import sys
+
+import pytest
+
+
+_SEP = "=" * 80
+_BANNER = " COMPLETE DOCUMENT SCANNER SYSTEM - TEST SUITE ".center(80)
+
+# Looked up once per process; the OCR fixture skips without touching torch
+_HAS_EASYOCR = importlib.util.find_spec("easyocr") is not None
+
+
+def pytest_report_header(config):
+    """Suite banner shown under pytest's own session header"""
+    return [_SEP, _BANNER, _SEP]
+
+
+@pytest.fixture
+def report(pytestconfig, capsys):
+    """
+    Writer for a test's report lines, active only under pytest -v.
+
+    The lines bypass output capturing, so they show up without -s.
+
+    Returns:
+        callable: Takes a list of lines and writes them to stdout in one call
+    """
+    if pytestconfig.getoption("verbose") <= 0:
+        return lambda lines: None
+
+    def write(lines):
+        with capsys.disabled():
+            sys.stdout.write("\n".join(lines) + "\n")
+    return write
+
+
+@pytest.fixture(scope="session")
+def ocr_extractor():
+    """EasyOCR-backed extractor (loads the reader once)"""
+    if not _HAS_EASYOCR:
+        pytest.skip("easyocr not installed")
+    from ocr import OCRExtractor
+    return OCRExtractor()
+
+
+@pytest.fixture(scope="session")
+def preprocessor():
+    from preprocess import ImagePreprocessor
+    return ImagePreprocessor()
+
+
+@pytest.fixture(scope="session")
+def parser():
+    from parser_rule_based import RuleBasedParser
+    return RuleBasedParser()
+
+
+@pytest.fixture(scope="session")
+def saver(tmp_path_factory):
+    """DataSaver writing into a session temp directory, not ./output"""
+    from saver import DataSaver
+    return DataSaver(str(tmp_path_factory.mktemp("output")))
+
+
+class FakeReader:
+    """
+    Stand-in for easyocr.Reader that answers from a script.
+    
+    respond(image) gives the detections ([bbox, text, confidence] entries)
+    for one image; every image passed in is recorded in calls.
+    """
+    
+    def __init__(self):
+        self.respond = lambda image: []
+        self.calls = []
+    
+    def readtext(self, image):
+        self.calls.append(image)
+        return self.respond(image)
+    
+    def readtext_batched(self, images, **kwargs):
+        self.calls.extend(images)
+        return [self.respond(image) for image in images]
+
+
+@pytest.fixture
+def fake_ocr(monkeypatch):
+    """OCRExtractor backed by a FakeReader (no easyocr/torch needed)"""
+    import ocr
+    monkeypatch.setattr(ocr, "_HAS_EASYOCR", True)
+    monkeypatch.setattr(ocr, "_get_reader", FakeReader)
+    return ocr.OCRExtractor()
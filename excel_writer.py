@@ -1,19 +1,123 @@
 """
 Excel Writer Module (Dynamic Columns)
 Automatically creates columns based on extracted OCR fields
+
+By default every append_row() rewrites the .xlsx (in openpyxl's
+streaming write-only mode) straight away, as the original writer did.
+With batch_size > 1, rows are appended to a JSON-lines journal next to
+the workbook ("<file>.xlsx.log") and only written into the .xlsx once
+batch_size rows are pending or on flush()/close(), so a long session
+pays for one rewrite per batch instead of one per row.
+
+A flush writes the new workbook to a temporary file and swaps it in with
+os.replace, so a crash leaves either the old or the new workbook on disk.
+Each journal entry records its target data row, so rows already in the
+swapped-in workbook are not replayed if the crash came before the journal
+was removed.
 """
 
+import json
+import os
+import tempfile
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.utils import get_column_letter as _gcl
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+
+# Shared style objects - assigned by reference, never rebuilt per cell
+_HEADER_FONT = Font(bold=True, color="FFFFFF")
+_HEADER_FILL = PatternFill("solid", fgColor="366092")
+_THIN_SIDE = Side(style="thin")
+_BORDER = Border(left=_THIN_SIDE, right=_THIN_SIDE, top=_THIN_SIDE, bottom=_THIN_SIDE)
+_ALIGN_CENTER = Alignment(horizontal="center", vertical="center")
+_ALIGN_LEFT = Alignment(horizontal="left", vertical="center")
+
+# Column letters indexed by 1-based column number ("" at index 0)
+_COL_LETTERS = [""] + [_gcl(i) for i in range(1, 257)]
+
+# Journal key holding a row's 1-based data row number (header excluded)
+_ROW_KEY = "__excel_row__"
+
+# Journal tag for cell values openpyxl writes natively but json can't encode
+_TYPE_KEY = "__excel_type__"
+_DECODERS = {
+    "datetime": datetime.fromisoformat,
+    "date": date.fromisoformat,
+    "time": time.fromisoformat,
+    "timedelta": lambda seconds: timedelta(seconds=float(seconds)),
+    "decimal": Decimal,
+}
+
+
+def _encode_value(value):
+    """
+    json.dumps default= hook: tag dates, times and Decimals for the journal.
+
+    Raises:
+        TypeError: For any other type json can't encode
+    """
+    # datetime before date: it is a date subclass
+    for name, kind in (("datetime", datetime), ("date", date), ("time", time)):
+        if isinstance(value, kind):
+            return {_TYPE_KEY: name, "value": value.isoformat()}
+    if isinstance(value, timedelta):
+        return {_TYPE_KEY: "timedelta", "value": repr(value.total_seconds())}
+    if isinstance(value, Decimal):
+        return {_TYPE_KEY: "decimal", "value": str(value)}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _decode_value(obj):
+    """json.loads object_hook: restore values tagged by _encode_value."""
+    if len(obj) == 2 and obj.get(_TYPE_KEY) in _DECODERS and "value" in obj:
+        return _DECODERS[obj[_TYPE_KEY]](obj["value"])
+    return obj
 
 
 class ExcelWriter:
-    def __init__(self, filepath: str):
+    def __init__(self, filepath: str, batch_size: int = 1):
+        """
+        Prepare the workbook and its append journal.
+
+        Args:
+            filepath (str): Path of the .xlsx file to append to
+            batch_size (int): Rewrite the workbook once this many rows are pending;
+                above 1, call close() (or use the writer as a context manager)
+                so the last rows reach the .xlsx
+        """
         self.filepath = filepath
+        self.log_path = f"{filepath}.log"
+        self.batch_size = max(1, batch_size)
         self.ensure_file_exists()
 
+        # Column order plus a parallel "center this column" flag per header;
+        # saved headers are kept by position, since existing rows are too
+        headers, saved_rows = self._read_sheet_info()
+        self._headers = list(headers)
+        self._center_mask = ["Contact" in h or "Marks" in h for h in headers]
+
+        # Rows not yet written to the workbook (mirrors the journal); starts
+        # with anything a previous session journaled but never flushed
+        self._pending_rows = self._read_log(saved_rows)
+        for row in self._pending_rows:
+            for key in row:
+                self._ensure_header(key)
+
+        # ExcelWriter is the only writer, so the row count is tracked in memory;
+        # the file's mtime is remembered to notice outside edits
+        self._row_count = saved_rows + len(self._pending_rows)
+        self._mtime = os.path.getmtime(self.filepath)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
     def ensure_file_exists(self):
         path = Path(self.filepath)
         path.parent.mkdir(parents=True, exist_ok=True)
@@ -24,74 +128,193 @@ class ExcelWriter:
             ws.title = "Scanned Data"
             wb.save(self.filepath)
 
+    def _ensure_header(self, key):
+        if key not in self._headers:
+            self._headers.append(key)
+            self._center_mask.append("Contact" in key or "Marks" in key)
+
+    def _read_sheet_info(self):
+        """
+        Read the header row and count data rows in a single read-only pass.
+
+        Returns:
+            tuple: (headers, data_row_count)
+        """
+        wb = openpyxl.load_workbook(self.filepath, read_only=True)
+        try:
+            rows = wb.active.iter_rows(values_only=True)
+            first_row = list(next(rows, ()))
+            # Trailing empty cells are padding; inner ones keep their column
+            while first_row and first_row[-1] is None:
+                first_row.pop()
+            headers = ["" if value is None else value for value in first_row]
+            # Write-only files carry no dimension record, so count rows
+            return headers, sum(1 for _ in rows)
+        finally:
+            wb.close()
+
+    def _read_log(self, saved_rows):
+        """
+        Read journaled rows that are not in the workbook yet.
+
+        Args:
+            saved_rows (int): Data rows already in the workbook
+
+        Returns:
+            list: Pending row dicts, in append order
+        """
+        if not os.path.exists(self.log_path):
+            return []
+
+        pending = []
+        with open(self.log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                fields = json.loads(line, object_hook=_decode_value)
+                # Saved by a flush that crashed before removing the journal
+                if fields.pop(_ROW_KEY, saved_rows + 1) <= saved_rows:
+                    continue
+                pending.append(fields)
+        return pending
+
     def _apply_header_style(self, cell):
-        cell.font = Font(bold=True, color="FFFFFF")
-        cell.fill = PatternFill("solid", fgColor="366092")
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        cell.border = Border(
-            left=Side(style="thin"),
-            right=Side(style="thin"),
-            top=Side(style="thin"),
-            bottom=Side(style="thin")
-        )
+        cell.font = _HEADER_FONT
+        cell.fill = _HEADER_FILL
+        cell.alignment = _ALIGN_CENTER
+        cell.border = _BORDER
 
     def _apply_cell_style(self, cell, center=False):
-        cell.alignment = Alignment(
-            horizontal="center" if center else "left",
-            vertical="center"
-        )
-        cell.border = Border(
-            left=Side(style="thin"),
-            right=Side(style="thin"),
-            top=Side(style="thin"),
-            bottom=Side(style="thin")
-        )
+        cell.alignment = _ALIGN_CENTER if center else _ALIGN_LEFT
+        cell.border = _BORDER
+
+    def _header_cell(self, ws, value):
+        cell = WriteOnlyCell(ws, value=value)
+        self._apply_header_style(cell)
+        return cell
+
+    def _body_cell(self, ws, value, center=False):
+        cell = WriteOnlyCell(ws, value=value)
+        self._apply_cell_style(cell, center=center)
+        return cell
 
     def append_row(self, fields: dict):
         """
         Append OCR extracted data dynamically
-        """
-        wb = openpyxl.load_workbook(self.filepath)
-        ws = wb.active
-
-        # Existing headers
-        headers = [cell.value for cell in ws[1]] if ws.max_row >= 1 else []
 
+        With batch_size > 1 the row is journaled immediately and written into
+        the workbook once batch_size rows are pending, or on flush()/close().
+        """
         # Add Timestamp automatically
         fields = dict(fields)
         fields["Timestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        # Create headers if empty
-        if not headers or headers == [None]:
-            for col, header in enumerate(fields.keys(), start=1):
-                cell = ws.cell(row=1, column=col, value=header)
-                self._apply_header_style(cell)
-                ws.column_dimensions[openpyxl.utils.get_column_letter(col)].width = 22
-
-            headers = list(fields.keys())
-
         # Add new headers if new fields appear
         for key in fields.keys():
-            if key not in headers:
-                headers.append(key)
-                col = len(headers)
-                cell = ws.cell(row=1, column=col, value=key)
-                self._apply_header_style(cell)
-                ws.column_dimensions[openpyxl.utils.get_column_letter(col)].width = 22
+            self._ensure_header(key)
+
+        self._row_count += 1
+        # An unbatched row is saved before append_row returns, so it
+        # needs no journal entry (and no extra fsync)
+        if self.batch_size > 1:
+            entry = {_ROW_KEY: self._row_count, **fields}
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False, default=_encode_value) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+        self._pending_rows.append(fields)
+
+        if len(self._pending_rows) >= self.batch_size:
+            self.flush()
+        else:
+            print(f"✓ Data queued for Excel (row {self._row_count + 1})")
+
+    def flush(self):
+        """
+        Rebuild the workbook with all pending rows and clear the journal.
+        """
+        pending = self._pending_rows
+        if not pending:
+            return
+
+        # Existing rows are read positionally under the old header order;
+        # new headers are only ever appended, so positions stay valid
+        src = openpyxl.load_workbook(self.filepath, read_only=True)
+        try:
+            existing = list(src.active.iter_rows(min_row=2, values_only=True))
+        finally:
+            src.close()
+
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet("Scanned Data")
+
+        for col in range(1, len(self._headers) + 1):
+            letter = _COL_LETTERS[col] if col < len(_COL_LETTERS) else _gcl(col)
+            ws.column_dimensions[letter].width = 22
+
+        ws.append([self._header_cell(ws, header) for header in self._headers])
+
+        # Data rows start at sheet row 2; heights must be set before a
+        # write-only row is streamed out
+        row_dimensions = ws.row_dimensions
+        row = 1
+
+        for values in existing:
+            row += 1
+            row_dimensions[row].height = 20
+            ws.append([
+                self._body_cell(ws, value, center=center)
+                for value, center in zip(values, self._center_mask)
+            ])
+
+        for fields in pending:
+            row += 1
+            row_dimensions[row].height = 20
+            ws.append([
+                self._body_cell(ws, fields.get(header, ""), center=center)
+                for header, center in zip(self._headers, self._center_mask)
+            ])
+
+        self._replace_workbook(wb)
+        # Only now may the journal go; a crash before this line is replayed
+        # without duplicates (see _read_log)
+        self._clear_journal()
+        self._pending_rows = []
+        self._mtime = os.path.getmtime(self.filepath)
+
+        if len(pending) == 1:
+            print(f"✓ Data saved to Excel (row {row})")
+        else:
+            print(f"✓ Data saved to Excel (rows {row - len(pending) + 1}-{row})")
 
-        # Append data row
-        row = ws.max_row + 1
-        for col, header in enumerate(headers, start=1):
-            value = fields.get(header, "")
-            cell = ws.cell(row=row, column=col, value=value)
-            self._apply_cell_style(cell, center=("Contact" in header or "Marks" in header))
+    def _replace_workbook(self, wb):
+        """Save wb to a temporary file beside the target, then swap it in."""
+        directory, name = os.path.split(os.path.abspath(self.filepath))
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                wb.save(f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.filepath)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
 
-        ws.row_dimensions[row].height = 20
-        wb.save(self.filepath)
+    def _clear_journal(self):
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
 
-        print(f"✓ Data saved to Excel (row {row})")
+    def close(self):
+        """Write any pending rows to the workbook."""
+        self.flush()
 
     def get_row_count(self):
-        wb = openpyxl.load_workbook(self.filepath)
-        ws = wb.active
-        return ws.max_row - 1
+        # Only re-read the workbook if something else modified it
+        if os.path.getmtime(self.filepath) != self._mtime:
+            _, saved_rows = self._read_sheet_info()
+            self._row_count = saved_rows + len(self._pending_rows)
+            self._mtime = os.path.getmtime(self.filepath)
+        return self._row_count
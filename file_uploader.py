@@ -5,15 +5,41 @@ Provides file dialog interface for image/PDF selection with PDF-to-image convers
 
 import cv2
 import numpy as np
-from tkinter import Tk, filedialog
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import fitz  # PyMuPDF - renders in-process, no poppler subprocess
+    _HAS_PYMUPDF = True
+except ImportError:
+    _HAS_PYMUPDF = False
+
 try:
     from pdf2image import convert_from_path
     _HAS_PDF2IMAGE = True
 except ImportError:
     _HAS_PDF2IMAGE = False
 
+PDF_DPI = 300
+
+
+@lru_cache(maxsize=None)
+def _get_tk_root():
+    """
+    Create the hidden Tkinter root once and reuse it for every dialog.
+    
+    tkinter is imported here so camera-only sessions never load it.
+    
+    Returns:
+        Tk: Hidden, topmost root window
+    """
+    from tkinter import Tk
+    
+    root = Tk()
+    root.withdraw()
+    root.attributes("-topmost", True)
+    return root
+
 
 class FileUploader:
     """Handles file upload and image loading from disk (supports JPG, PNG, PDF, etc.)."""
@@ -30,12 +56,13 @@ class FileUploader:
                    or (None, None) if upload was cancelled or failed
         """
         try:
-            # Create and hide Tkinter root window
-            root = Tk()
-            root.withdraw()
-            root.attributes("-topmost", True)
+            from tkinter import filedialog
+            
+            # Reuse the hidden Tkinter root window across uploads
+            root = _get_tk_root()
             
             file_path = filedialog.askopenfilename(
+                parent=root,
                 title="Select Document Image or PDF",
                 filetypes=[
                     ("All Supported", "*.jpg *.jpeg *.png *.bmp *.tiff *.gif *.pdf"),
@@ -45,7 +72,8 @@ class FileUploader:
                 ]
             )
             
-            root.destroy()
+            # Process pending events so the closed dialog disappears
+            root.update()
             
             if not file_path:
                 print("⊘ No file selected - upload cancelled")
@@ -81,37 +109,95 @@ class FileUploader:
         """
         Convert PDF to image and load first page.
         
+        Uses PyMuPDF when installed (in-process rendering), otherwise
+        falls back to pdf2image + poppler.
+        
         Args:
             file_path (str): Path to PDF file
             
         Returns:
             tuple: (image, file_path) or (None, None) if failed
         """
-        if not _HAS_PDF2IMAGE:
-            print("❌ ERROR: pdf2image not installed")
-            print("   Install with: pip install pdf2image")
-            print("   Note: Also requires poppler-utils")
+        if not _HAS_PYMUPDF and not _HAS_PDF2IMAGE:
+            print("❌ ERROR: No PDF renderer installed")
+            print("   Install with: pip install pymupdf")
+            print("   (or: pip install pdf2image - also requires poppler-utils)")
             return None, None
         
+        print(f"📄 Converting PDF to image: {file_path}")
+        
+        if _HAS_PYMUPDF:
+            image = FileUploader._render_pdf_pymupdf(file_path)
+        else:
+            image = FileUploader._render_pdf_pdf2image(file_path)
+        
+        if image is None:
+            return None, None
+        
+        print(f"✓ PDF loaded successfully: {file_path}")
+        print(f"  Dimensions: {image.shape[1]} x {image.shape[0]} pixels ({PDF_DPI} DPI)")
+        return image, file_path
+    
+    @staticmethod
+    def _render_pdf_pymupdf(file_path):
+        """
+        Render the first PDF page with PyMuPDF.
+        
+        Args:
+            file_path (str): Path to PDF file
+            
+        Returns:
+            ndarray: First page in BGR format, or None if failed
+        """
         try:
-            print(f"📄 Converting PDF to image: {file_path}")
+            doc = fitz.open(file_path)
+            try:
+                if doc.page_count == 0:
+                    print("❌ ERROR: PDF conversion failed - document has no pages")
+                    return None
+                
+                zoom = PDF_DPI / 72
+                page = doc.load_page(0)
+                pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csRGB, alpha=False)
+                
+                # Zero-copy view of the pixmap; cvtColor writes the BGR result
+                rgb = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)
+                return cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+            finally:
+                doc.close()
+                
+        except Exception as e:
+            print(f"❌ ERROR during PDF conversion: {e}")
+            return None
+    
+    @staticmethod
+    def _render_pdf_pdf2image(file_path):
+        """
+        Render the first PDF page with pdf2image (poppler).
+        
+        Args:
+            file_path (str): Path to PDF file
             
+        Returns:
+            ndarray: First page in BGR format, or None if failed
+        """
+        try:
             # Convert only first page
-            images = convert_from_path(file_path, first_page=1, last_page=1, dpi=300)
+            images = convert_from_path(file_path, first_page=1, last_page=1, dpi=PDF_DPI)
             
             if not images:
                 print("❌ ERROR: PDF conversion failed - empty result")
-                return None, None
+                return None
             
             # Get first page as PIL image
             pil_image = images[0]
             
             # Convert PIL image to OpenCV format (BGR)
-            image = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
-            
-            print(f"✓ PDF loaded successfully: {file_path}")
-            print(f"  Dimensions: {image.shape[1]} x {image.shape[0]} pixels (300 DPI)")
-            return image, file_path
+            # np.array() makes the one writable copy we need; the RGB->BGR swap
+            # then runs in place instead of allocating a second full page
+            image = np.array(pil_image)
+            cv2.cvtColor(image, cv2.COLOR_RGB2BGR, dst=image)
+            return image
             
         except Exception as e:
             print(f"❌ ERROR during PDF conversion: {e}")
@@ -119,7 +205,7 @@ class FileUploader:
             print("   - Windows: pip install python-poppler")
             print("   - Linux: sudo apt-get install poppler-utils")
             print("   - macOS: brew install poppler")
-            return None, None
+            return None
     
     @staticmethod
     def validate_image(frame):
@@ -132,13 +218,4 @@ class FileUploader:
         Returns:
             bool: True if frame is valid, False otherwise
         """
-        if frame is None:
-            return False
-        
-        if not hasattr(frame, 'shape') or len(frame.shape) < 2:
-            return False
-        
-        if frame.size == 0:
-            return False
-        
-        return True
+        return isinstance(frame, np.ndarray) and frame.ndim >= 2 and frame.size > 0
@@ -3,7 +3,7 @@ Document Scanner - Main Orchestrator
 Implements complete end-to-end pipeline:
 
 1. INPUT: Capture (camera) or Upload (file)
-2. PREPROCESS: Grayscale + Adaptive threshold
+2. PREPROCESS: Grayscale + denoise + CLAHE + Otsu threshold
 3. OCR: Extract text with positions and confidence
 4. QUALITY CHECK: Average OCR confidence
 5. CONFIDENCE VALIDATION:
@@ -18,12 +18,12 @@ Usage:
     python main.py
 """
 
+import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from config import OCR_CONFIDENCE_THRESHOLD
 
-from camera import CameraCapture
-from file_uploader import FileUploader
 from preprocess import ImagePreprocessor
 from ocr import OCRExtractor
 from roi_based_parser import ROIBasedParser  # NEW: ROI-based extraction (more accurate)
@@ -31,6 +31,14 @@ from review import FieldReviewer
 from saver import DataSaver
 
 
+# Input menu choice -> (input method, confirmation message)
+CHOICES = {
+    "1": ("camera", "✓ Selected: Camera capture"),
+    "2": ("upload", "✓ Selected: File upload"),
+    "3": (None, "👋 Exiting..."),
+}
+
+
 class DocumentScannerPipeline:
     """Main orchestrator for document scanning pipeline."""
     
@@ -45,14 +53,50 @@ class DocumentScannerPipeline:
         self.output_dir = Path("output")
         self.output_dir.mkdir(exist_ok=True)
         
+        # Background workers for pipeline stages that can overlap
+        self._pool = ThreadPoolExecutor(max_workers=2)
+        
         # Initialize components
         self.camera = None
         self.preprocessor = ImagePreprocessor()
-        self.ocr_extractor = OCRExtractor()
-        self.roi_parser = ROIBasedParser(ocr_extractor=self.ocr_extractor)  # NEW: ROI-based parser
+        # EasyOCR loads (and may download) its models while the input menu
+        # is shown; run() waits for it once a capture/upload is chosen
+        self._ocr_future = self._pool.submit(OCRExtractor)
+        self._roi_parser = None
         self.reviewer = FieldReviewer()
         self.saver = DataSaver(str(self.output_dir))
     
+    def wait_for_ocr(self) -> bool:
+        """
+        Wait for the background OCR initialization and report the outcome.
+        
+        Returns:
+            bool: True if the OCR engine is ready, False if it failed to load
+        """
+        waiting = not self._ocr_future.done()
+        if waiting:
+            print("🔤 Loading EasyOCR models (may download on first run)...")
+        try:
+            self._ocr_future.result()
+        except Exception as e:
+            print(f"❌ ERROR: OCR engine failed to initialize: {e}")
+            return False
+        if waiting:
+            print("✓ OCR engine ready")
+        return True
+    
+    @property
+    def ocr_extractor(self) -> OCRExtractor:
+        """OCR engine; blocks until background initialization is done."""
+        return self._ocr_future.result()
+    
+    @property
+    def roi_parser(self) -> ROIBasedParser:
+        """ROI-based parser, created on first use once OCR is ready."""
+        if self._roi_parser is None:
+            self._roi_parser = ROIBasedParser(ocr_extractor=self.ocr_extractor)  # NEW: ROI-based parser
+        return self._roi_parser
+    
     def show_input_menu(self) -> str:
         """
         Show input method menu and get user choice.
@@ -70,19 +114,14 @@ class DocumentScannerPipeline:
         print()
         
         while True:
-            choice = input("Enter choice (1/2/3): ").strip()
+            entry = CHOICES.get(input("Enter choice (1/2/3): ").strip())
+            
+            if entry:
+                method, message = entry
+                print(message)
+                return method
             
-            if choice == "1":
-                print("✓ Selected: Camera capture")
-                return "camera"
-            elif choice == "2":
-                print("✓ Selected: File upload")
-                return "upload"
-            elif choice == "3":
-                print("👋 Exiting...")
-                return None
-            else:
-                print("❌ Invalid choice. Please enter 1, 2, or 3")
+            print("❌ Invalid choice. Please enter 1, 2, or 3")
     
     def capture_from_camera(self):
         """
@@ -91,6 +130,9 @@ class DocumentScannerPipeline:
         Returns:
             ndarray: Captured frame or None if cancelled
         """
+        # Imported here so upload-only sessions skip the camera module
+        from camera import CameraCapture
+        
         print("\n" + "-"*80)
         
         self.camera = CameraCapture(camera_id=0)
@@ -111,6 +153,9 @@ class DocumentScannerPipeline:
         Returns:
             ndarray: Loaded image or None if cancelled
         """
+        # Imported here so camera-only sessions skip tkinter/pdf renderers
+        from file_uploader import FileUploader
+        
         print("\n" + "-"*80)
         
         frame, file_path = FileUploader.upload_image()
@@ -125,7 +170,7 @@ class DocumentScannerPipeline:
         Execute complete scanning pipeline.
         
         Pipeline steps:
-        1. Preprocessing (grayscale + adaptive threshold)
+        1. Preprocessing (grayscale + denoise + CLAHE + Otsu threshold)
         2. OCR extraction (text + positions + confidence)
         3. Quality check (calculate average confidence)
         4. Parser selection (rule-based vs OpenAI)
@@ -147,13 +192,9 @@ class DocumentScannerPipeline:
         print("\n[Step 1/7] 🛠️  Image Preprocessing...")
         print("-" * 40)
         
-        processed = self.preprocessor.preprocess(frame)
-        
-        if processed is None:
-            print("❌ ERROR: Preprocessing failed")
-            return False
-        
-        print("✓ Image preprocessed successfully")
+        # Runs on a worker thread: ROI extraction below works on the ORIGINAL
+        # frame, so both can proceed at once (OpenCV/torch release the GIL)
+        preprocess_future = self._pool.submit(self.preprocessor.preprocess, frame)
         
         # IMPROVED: Skip full-image OCR, use ROI-based extraction instead
         # WHY: Each field extracted from fixed position → no shifting, better accuracy
@@ -167,6 +208,14 @@ class DocumentScannerPipeline:
         # WHY: ROI parser does its own preprocessing per field
         extracted_data = self.roi_parser.parse_form(frame, self.ocr_extractor)
         
+        processed = preprocess_future.result()
+        
+        if processed is None:
+            print("❌ ERROR: Preprocessing failed")
+            return False
+        
+        print("✓ Image preprocessed successfully")
+        
         if not extracted_data:
             print("❌ ERROR: No fields could be extracted")
             return False
@@ -267,12 +316,16 @@ class DocumentScannerPipeline:
         """Main application loop."""
         try:
             while True:
-                # Get input method
+                # Get input method (the OCR models keep loading meanwhile)
                 input_method = self.show_input_menu()
                 
                 if input_method is None:
                     break
                 
+                # Fail before any document work, not after a capture/upload
+                if not self.wait_for_ocr():
+                    return
+                
                 # Capture or upload image
                 print()
                 if input_method == "camera":
@@ -303,10 +356,14 @@ class DocumentScannerPipeline:
             print(f"\n❌ Unexpected error: {e}")
             import traceback
             traceback.print_exc()
+        finally:
+            self._pool.shutdown(wait=False)
 
 
 def main():
     """Entry point - Start the document scanner."""
+    # Module step logs are DEBUG; warnings/errors print like the rest of the UI
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     pipeline = DocumentScannerPipeline()
     pipeline.run()
 
@@ -9,7 +9,16 @@ EasyOCR Features:
 - High accuracy for mixed document types
 """
 
+import logging
+import platform
+import threading
+
+import cv2
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from config import OCR_DEVICE, OCR_WORKERS, OCR_QUANTIZE, OCR_MAX_SIDE
 
 try:
     import easyocr
@@ -17,20 +26,132 @@ try:
 except Exception:
     _HAS_EASYOCR = False
 
+logger = logging.getLogger(__name__)
+
+
+def _use_gpu():
+    """
+    Decide whether EasyOCR should run on the GPU.
+
+    Returns:
+        bool: True for OCR_DEVICE "cuda", or "auto" with CUDA available
+    """
+    if OCR_DEVICE == "cpu":
+        return False
+    if OCR_DEVICE == "cuda":
+        return True
+
+    try:
+        import torch  # installed with easyocr
+        return torch.cuda.is_available()
+    except Exception:
+        return False
+
+
+def _use_quantize():
+    """
+    Decide whether the CPU models should be int8-quantized.
+
+    EasyOCR already quantizes by default, so this is an explicit toggle
+    rather than a speedup: OCR_QUANTIZE = False forces the float models,
+    and they are also used on CPUs without PyTorch quantized kernels
+    (anything but x86-64 and 64-bit ARM).
+
+    Returns:
+        bool: True if OCR_QUANTIZE is set and the CPU has int8 kernels
+    """
+    machine = platform.machine().lower()
+    return OCR_QUANTIZE and machine in ("x86_64", "amd64", "aarch64", "arm64")
+
+
+# torch.set_num_threads is process-wide, so overlapping
+# _single_intra_op_thread blocks (e.g. from two pipelines' threads) share
+# one saved setting, restored only when the last block exits
+_intra_op_lock = threading.Lock()
+_intra_op_state = {"blocks": 0, "previous": None}
+
+
+@contextmanager
+def _single_intra_op_thread():
+    """
+    Run torch ops on one intra-op thread for the duration of the block.
+
+    Used while several readtext() calls run concurrently, so N threads
+    don't each fan out over every core; the previous setting is restored
+    afterwards, leaving full-page and single-ROI OCR multi-threaded.
+
+    The setting is process-wide: any other torch work in the process also
+    runs single-threaded while a block is active.
+    """
+    try:
+        import torch  # installed with easyocr
+    except Exception:
+        yield
+        return
+
+    with _intra_op_lock:
+        if _intra_op_state["blocks"] == 0:
+            _intra_op_state["previous"] = torch.get_num_threads()
+            torch.set_num_threads(1)
+        _intra_op_state["blocks"] += 1
+    try:
+        yield
+    finally:
+        with _intra_op_lock:
+            _intra_op_state["blocks"] -= 1
+            if _intra_op_state["blocks"] == 0:
+                torch.set_num_threads(_intra_op_state["previous"])
+
+
+# One record per EasyOCR detection; text stays an object field so long
+# strings are never truncated
+_DETECTION_DTYPE = np.dtype([
+    ("text", object),
+    ("left", np.int32),
+    ("top", np.int32),
+    ("width", np.int32),
+    ("height", np.int32),
+    ("confidence", np.int32),
+])
+
+# Zero-length arrays of the same per-field dtypes, so "nothing detected"
+# has the same shape as a real result
+_EMPTY = {field: np.empty(0, dtype=_DETECTION_DTYPE[field]) for field in _DETECTION_DTYPE.names}
+
+
+@lru_cache(maxsize=None)
+def _get_reader():
+    """
+    Create the process-wide EasyOCR reader (once) and warm it up.
+
+    The warm-up pass forces model weights onto the device so the first
+    real document does not pay that latency.
+
+    Returns:
+        easyocr.Reader: Shared reader instance
+    """
+    # Logged, not printed: this may run on a background thread (main.py)
+    logger.debug("🔤 Initializing EasyOCR (may download model on first run)...")
+    gpu = _use_gpu()
+    # Initialize reader for English language
+    # (quantize only affects CPU and matches EasyOCR's default of True;
+    # passed explicitly so config.OCR_QUANTIZE can turn it off)
+    reader = easyocr.Reader(['en'], gpu=gpu, verbose=False, quantize=_use_quantize())
+    reader.readtext(np.zeros((32, 32, 3), dtype=np.uint8))
+    logger.debug("✓ EasyOCR initialized successfully (%s)", "GPU" if gpu else "CPU")
+    return reader
+
 
 class OCRExtractor:
     """Extracts text with positional and confidence data using EasyOCR."""
 
     def __init__(self):
-        """Initialize OCR extractor with EasyOCR."""
+        """Initialize OCR extractor with the shared EasyOCR reader."""
         if not _HAS_EASYOCR:
-            print("❌ easyocr not installed. Run: pip install easyocr")
-            raise ImportError("easyocr is required")
+            raise ImportError("easyocr not installed. Run: pip install easyocr")
 
-        print("🔤 Initializing EasyOCR (may download model on first run)...")
-        # Initialize reader for English language
-        self.reader = easyocr.Reader(['en'], gpu=False, verbose=False)
-        print("✓ EasyOCR initialized successfully")
+        # All extractors share one reader; only the first construction loads it
+        self.reader = _get_reader()
 
     def extract_ocr_data(self, preprocessed_image, mode="form"):
         """
@@ -47,14 +168,15 @@ class OCRExtractor:
             mode (str): Ignored for EasyOCR (kept for API compatibility)
 
         Returns:
-            dict: OCR data dictionary with keys:
-                - text: list of extracted words
-                - left: list of x-coordinates (bounding box top-left)
-                - top: list of y-coordinates (bounding box top-left)
-                - width: list of bounding box widths
-                - height: list of bounding box heights
-                - confidence: list of confidence scores (0-100)
-                - raw_data: raw EasyOCR output
+            dict: OCR data dictionary with keys (parallel arrays):
+                - text: object ndarray of extracted words
+                - left: int32 ndarray of x-coordinates (bounding box top-left)
+                - top: int32 ndarray of y-coordinates (bounding box top-left)
+                - width: int32 ndarray of bounding box widths
+                - height: int32 ndarray of bounding box heights
+                - confidence: int32 ndarray of confidence scores (0-100)
+                - raw_data: raw EasyOCR output (coordinates of the image
+                  EasyOCR saw, i.e. after any OCR_MAX_SIDE downscale)
         """
         try:
             if preprocessed_image is None:
@@ -63,66 +185,59 @@ class OCRExtractor:
 
             print("🔤 Extracting text with EasyOCR...")
 
+            # Detection cost scales with H×W; forms read fine at OCR_MAX_SIDE,
+            # so oversized pages are shrunk and boxes mapped back afterwards
+            ocr_image = preprocessed_image
+            height, width = preprocessed_image.shape[:2]
+            scale = min(1.0, OCR_MAX_SIDE / max(height, width))
+            if scale < 1.0:
+                ocr_image = cv2.resize(preprocessed_image, None, fx=scale, fy=scale,
+                                       interpolation=cv2.INTER_AREA)
+
             # Run EasyOCR detection
             # Returns list of [bbox, text, confidence]
             # bbox is [[x1,y1], [x2,y2], [x3,y3], [x4,y4]] (4 corners)
-            results = self.reader.readtext(preprocessed_image)
+            results = self.reader.readtext(ocr_image)
 
             if not results:
                 print("❌ No text detected in image")
                 return self._empty_ocr_data()
 
-            # Process results - extract text, positions, and confidence
+            # Process results - extract text, positions, and confidence,
+            # written column-wise straight into one preallocated record array
+            detections = np.empty(len(results), dtype=_DETECTION_DTYPE)
+            detections["text"] = [text.strip() for _, text, _ in results]
+
+            # All bboxes as one (N, 4, 2) array - [[x1,y1], ..., [x4,y4]] per
+            # detection - mapped back to the original image's coordinates
+            boxes = (np.array([bbox for bbox, _, _ in results], dtype=np.float64) / scale).astype(np.int32)
+            mins = boxes.min(axis=1)
+            maxs = boxes.max(axis=1)
+            detections["left"] = mins[:, 0]
+            detections["top"] = mins[:, 1]
+            detections["width"] = maxs[:, 0] - mins[:, 0]
+            detections["height"] = maxs[:, 1] - mins[:, 1]
+
+            # Convert confidence from 0-1 scale to 0-100%
+            detections["confidence"] = np.fromiter(
+                (conf * 100 for _, _, conf in results), dtype=np.float64, count=len(results)
+            ).astype(np.int32)
+
+            # Sort by position (top-to-bottom, left-to-right) on one packed
+            # int64 key; stable so equal positions keep EasyOCR's order
+            sort_key = (detections["top"].astype(np.int64) << 32) + detections["left"]
+            order = np.argsort(sort_key, kind="stable")
+
+            # Filter out low-confidence or empty detections, then slice once
+            valid = (detections["confidence"] > 0) & (detections["text"] != "")
+            detections = detections[order[valid[order]]]
+
+            # Structure-of-arrays output: one contiguous ndarray per field
             processed_data = {
-                "text": [],
-                "left": [],
-                "top": [],
-                "width": [],
-                "height": [],
-                "confidence": [],
+                field: np.ascontiguousarray(detections[field])
+                for field in ("text", "left", "top", "width", "height", "confidence")
             }
 
-            # Sort by position (top-to-bottom, left-to-right) for consistency
-            all_detections = []
-            for bbox, text, conf in results:
-                # bbox is [[x1,y1], [x2,y2], [x3,y3], [x4,y4]]
-                xs = [point[0] for point in bbox]
-                ys = [point[1] for point in bbox]
-
-                x_min = int(min(xs))
-                y_min = int(min(ys))
-                x_max = int(max(xs))
-                y_max = int(max(ys))
-
-                width = x_max - x_min
-                height = y_max - y_min
-
-                # Convert confidence from 0-1 scale to 0-100%
-                confidence = int(conf * 100)
-
-                # Store detection info
-                all_detections.append({
-                    "text": text.strip(),
-                    "left": x_min,
-                    "top": y_min,
-                    "width": width,
-                    "height": height,
-                    "confidence": confidence,
-                })
-
-            # Sort by position (top-to-bottom, left-to-right)
-            all_detections.sort(key=lambda x: (x["top"], x["left"]))
-
-            # Filter out low-confidence or empty detections
-            for detection in all_detections:
-                if detection["confidence"] > 0 and detection["text"]:
-                    processed_data["text"].append(detection["text"])
-                    processed_data["left"].append(detection["left"])
-                    processed_data["top"].append(detection["top"])
-                    processed_data["width"].append(detection["width"])
-                    processed_data["height"].append(detection["height"])
-                    processed_data["confidence"].append(detection["confidence"])
-
             processed_data["raw_data"] = results
 
             print(f"✓ OCR extraction complete: {len(processed_data['text'])} words detected")
@@ -165,10 +280,15 @@ class OCRExtractor:
         Returns:
             float: Average confidence (0-100) or 0 if no data
         """
-        if not ocr_data.get("confidence") or len(ocr_data["confidence"]) == 0:
+        confidence = ocr_data.get("confidence")
+        if confidence is None or len(confidence) == 0:
             return 0
 
-        return float(np.mean(ocr_data["confidence"]))
+        # Arrays (extract_ocr_data) reduce in place; plain lists skip the
+        # ndarray conversion np.mean would do
+        if isinstance(confidence, np.ndarray):
+            return float(confidence.mean())
+        return sum(confidence) / len(confidence)
 
     @staticmethod
     def print_ocr_summary(ocr_data):
@@ -193,15 +313,9 @@ class OCRExtractor:
     @staticmethod
     def _empty_ocr_data():
         """Return empty OCR data structure."""
-        return {
-            "text": [],
-            "left": [],
-            "top": [],
-            "width": [],
-            "height": [],
-            "confidence": [],
-            "raw_data": None,
-        }
+        empty = {field: array.copy() for field, array in _EMPTY.items()}
+        empty["raw_data"] = None
+        return empty
 
     def extract_roi_text(self, roi_image):
         """
@@ -229,23 +343,126 @@ class OCRExtractor:
         try:
             # Run EasyOCR on the ROI
             results = self.reader.readtext(roi_image)
+            return self._roi_result(results)
 
-            if not results:
-                return {"text": "", "confidence": 0, "raw": results}
+        except Exception as e:
+            print(f"❌ ERROR during ROI OCR extraction: {e}")
+            return {"text": "", "confidence": 0, "raw": None}
 
-            # Concatenate all detected text
-            full_text = " ".join([text for (bbox, text, conf) in results])
+    def extract_batch(self, rois):
+        """
+        Extract text from several ROI images in one batched EasyOCR call.
 
-            # Calculate average confidence
-            confidences = [conf * 100 for (bbox, text, conf) in results]
-            avg_confidence = np.mean(confidences) if confidences else 0
+        ROIs are padded (white, bottom/right) to a common size so the
+        detector and recognizer run over them as a single batch instead of
+        one readtext() call per field.
 
-            return {
-                "text": full_text.strip(),
-                "confidence": avg_confidence,
-                "raw": results
-            }
+        Args:
+            rois (list): Preprocessed ROI images (ndarray), one per field
+
+        Returns:
+            list: One dict per ROI, same structure as extract_roi_text()
+        """
+        outputs = [{"text": "", "confidence": 0, "raw": None} for _ in rois]
+        valid = [i for i, roi in enumerate(rois) if roi is not None and roi.size > 0]
+
+        if not valid:
+            return outputs
+
+        try:
+            batch = self._pad_batch([rois[i] for i in valid])
+            results = self.reader.readtext_batched(
+                batch,
+                batch_size=min(len(batch), 16),
+                detail=1,
+                paragraph=False,
+            )
+
+            for i, detections in zip(valid, results):
+                outputs[i] = self._roi_result(detections)
 
         except Exception as e:
-            print(f"❌ ERROR during ROI OCR extraction: {e}")
-            return {"text": "", "confidence": 0, "raw": None}
+            print(f"❌ ERROR during batched ROI OCR extraction: {e}")
+
+        return outputs
+
+    def extract_rois_parallel(self, rois, max_workers=None):
+        """
+        Extract text from several ROI images concurrently.
+
+        Fallback for ROIs that should not be padded into one batch: each
+        ROI gets its own readtext() call on a thread pool (torch releases
+        the GIL inside its native ops, so the calls overlap). While the
+        pool runs, torch is limited to one intra-op thread process-wide
+        (see _single_intra_op_thread).
+
+        Args:
+            rois (list): Preprocessed ROI images (ndarray), one per field
+            max_workers (int): Thread count (default: OCR_WORKERS)
+
+        Returns:
+            list: One dict per ROI, same structure as extract_roi_text()
+        """
+        if not rois:
+            return []
+
+        workers = min(max_workers or OCR_WORKERS, len(rois))
+        if workers <= 1:
+            return [self.extract_roi_text(roi) for roi in rois]
+
+        # Parallelism comes from the concurrent calls here, not from torch
+        with _single_intra_op_thread(), ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(self.extract_roi_text, rois))
+
+    @staticmethod
+    def _pad_batch(images):
+        """
+        Pad images with white to the largest height/width in the list.
+
+        Grayscale images are expanded to 3 channels when the batch mixes
+        grayscale and color ROIs.
+
+        Args:
+            images (list): ROI images (ndarray)
+
+        Returns:
+            list: Equally-sized images
+        """
+        if any(img.ndim == 3 for img in images):
+            images = [np.dstack([img] * 3) if img.ndim == 2 else img for img in images]
+
+        max_h = max(img.shape[0] for img in images)
+        max_w = max(img.shape[1] for img in images)
+
+        padded = []
+        for img in images:
+            pad = [(0, max_h - img.shape[0]), (0, max_w - img.shape[1])] + [(0, 0)] * (img.ndim - 2)
+            padded.append(np.pad(img, pad, mode="constant", constant_values=255))
+        return padded
+
+    @staticmethod
+    def _roi_result(results):
+        """
+        Collapse EasyOCR detections for one ROI into a single text value.
+
+        Args:
+            results (list): EasyOCR output as [bbox, text, confidence] entries
+
+        Returns:
+            dict: {"text": ..., "confidence": ..., "raw": results}
+        """
+        if not results:
+            return {"text": "", "confidence": 0, "raw": results}
+
+        # Concatenate all detected text
+        full_text = " ".join([text for (bbox, text, conf) in results])
+
+        # Calculate average confidence
+        confidences = [conf * 100 for (bbox, text, conf) in results]
+        avg_confidence = np.mean(confidences) if confidences else 0
+
+        return {
+            "text": full_text.strip(),
+            "confidence": avg_confidence,
+            "raw": results
+        }
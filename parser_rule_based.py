@@ -12,9 +12,33 @@ STRATEGY:
 """
 
 import re
+import numpy as np
 from typing import Dict, List, Tuple
 
 
+# Value validators, compiled once at import
+_NAME_RE = re.compile(r'^[a-zA-Z\s\-\']+$')
+_PHONE_RE = re.compile(r'^[0-9\s\-\+\(\)]+$')
+_DATE_RE = re.compile(r'\d{1,4}[-/\.]\d{1,2}[-/\.]\d{1,4}')
+_MARKS_RE = re.compile(r'^[\d\.%\s]+$')
+_DIGIT_RE = re.compile(r'\d')
+
+# Bytes twins of the whole-string validators for ASCII-only words (the
+# common case), where bytes regexes skip the Unicode matching paths.
+# \x1c-\x1f keeps bytes whitespace in line with str \s on ASCII input.
+_ASCII_SPACE = rb' \t\n\r\f\v\x1c-\x1f'
+_NAME_RE_B = re.compile(rb"^[a-zA-Z" + _ASCII_SPACE + rb"\-']+$")
+_PHONE_RE_B = re.compile(rb'^[0-9' + _ASCII_SPACE + rb'\-\+\(\)]+$')
+_MARKS_RE_B = re.compile(rb'^[0-9\.%' + _ASCII_SPACE + rb']+$')
+
+
+def _full_match(str_pattern: re.Pattern, bytes_pattern: re.Pattern, text: str) -> bool:
+    """Match text against a validator, via its bytes twin when text is ASCII."""
+    if text.isascii():
+        return bytes_pattern.match(text.encode("ascii")) is not None
+    return str_pattern.match(text) is not None
+
+
 class RuleBasedParser:
     """Extracts form data using label+position based rules."""
     
@@ -43,6 +67,15 @@ class RuleBasedParser:
             for keyword in keywords:
                 self.all_label_keywords.add(keyword.lower())
         
+        # One compiled alternation per field: a single C-level scan per word
+        # instead of a Python loop over keywords. Searched against text.lower()
+        # (not IGNORECASE, whose case folding differs), so matches are exactly
+        # the old "keyword in text.lower()" substring check
+        self._label_patterns = {
+            field_name: re.compile("|".join(map(re.escape, keywords)))
+            for field_name, keywords in self.FIELD_LABELS.items()
+        }
+        
         # Positioning thresholds
         self.position_threshold = 15      # pixels - same line if within this
         self.min_horizontal_gap = 120     # Minimum gap between label and value
@@ -54,6 +87,7 @@ class RuleBasedParser:
         
         Args:
             ocr_data (dict): OCR data with keys: text, left, top, width, height, confidence
+                             (parallel ndarrays or lists)
         
         Returns:
             dict: Extracted fields with structure:
@@ -64,19 +98,46 @@ class RuleBasedParser:
                     }
                 }
         """
-        if not ocr_data.get("text") or len(ocr_data["text"]) == 0:
+        texts = ocr_data.get("text")
+        if texts is None or len(texts) == 0:
             print("⚠ WARNING: No OCR text to parse")
             return {}
         
         print("📋 Starting rule-based parsing...")
         extracted_fields = {}
         
-        # For each field, try to find label + value pair
-        for field_name, label_keywords in self.FIELD_LABELS.items():
+        # Positions as arrays so each field's same-line/right-of-label
+        # filter is a single vectorized mask
+        ocr_data = dict(ocr_data)
+        ocr_data["left"] = np.asarray(ocr_data["left"])
+        ocr_data["top"] = np.asarray(ocr_data["top"])
+        
+        # Lowered/stripped forms are computed once per word, not per field
+        texts_lower = [text.lower() for text in texts]
+        texts_stripped = [text.strip() for text in texts]
+        
+        # Label-or-value classification, also done once per word
+        is_label = np.fromiter(
+            (self._is_label_text(text, lower) for text, lower in zip(texts, texts_lower)),
+            dtype=bool,
+            count=len(texts)
+        )
+        
+        # Locate every field's label in one sweep over the words
+        label_indices = self._find_labels(texts_lower, is_label)
+        
+        # For each field whose label was found, pair it with its value
+        for field_name in self._label_patterns:
+            label_index = label_indices.get(field_name)
+            if label_index is None:
+                continue
+            
             field_data = self._find_field_value(
                 field_name,
-                label_keywords,
-                ocr_data
+                label_index,
+                ocr_data,
+                is_label,
+                texts_stripped
             )
             
             if field_data is not None:
@@ -85,57 +146,52 @@ class RuleBasedParser:
         print(f"✓ Rule-based parsing complete: {len(extracted_fields)} fields extracted")
         return extracted_fields
     
-    def _find_field_value(self, field_name: str, label_keywords: List[str], 
-                          ocr_data: Dict) -> Dict:
+    def _find_field_value(self, field_name: str, label_index: int,
+                          ocr_data: Dict, is_label: np.ndarray,
+                          texts_stripped: List[str]) -> Dict:
         """
-        Find label and its corresponding value.
+        Find the value belonging to an already located label.
         
         Args:
             field_name (str): Name of field to extract
-            label_keywords (list): Possible label keywords
+            label_index (int): Index of the field's label in OCR data
             ocr_data (dict): OCR data
+            is_label (ndarray): Per-word _is_label_text() results
+            texts_stripped (list): Stripped OCR texts, parallel to ocr_data["text"]
         
         Returns:
             dict: {"value": ..., "confidence": ...} or None
         """
-        # Find label index
-        label_index = self._find_label(label_keywords, ocr_data)
-        
-        if label_index is None:
-            return None
-        
         # Get label position and dimensions
         label_left = ocr_data["left"][label_index]
         label_top = ocr_data["top"][label_index]
         label_right = label_left + ocr_data["width"][label_index]
         
-        # Find value to the right of the label
+        # Find value to the right of the label:
+        # same line (within position_threshold) and past the minimum gap,
+        # skipping label words (ends with colon, or is a label)
+        candidates = (
+            (np.abs(ocr_data["top"] - label_top) <= self.position_threshold)
+            & (ocr_data["left"] >= label_right + self.min_horizontal_gap)
+            & ~is_label
+        )
+        # Skip the label itself
+        candidates[label_index] = False
+        
         value_text = None
         value_confidence = 0
         
-        for i, text in enumerate(ocr_data["text"]):
-            # Skip the label itself
-            if i == label_index:
-                continue
-            
-            # Check if on same line (within position_threshold)
-            word_top = ocr_data["top"][i]
-            if abs(word_top - label_top) > self.position_threshold:
-                continue
-            
-            # Check if to the right of label with minimum gap
-            word_left = ocr_data["left"][i]
-            if word_left < (label_right + self.min_horizontal_gap):
-                continue
-            
-            # Skip if word is a label keyword (ends with colon, or is a label)
-            if self._is_label_text(text):
-                continue
+        for i in np.nonzero(candidates)[0]:
+            text = ocr_data["text"][i]
             
             # Validate value based on field type
-            if self._validate_value(text, field_name):
+            if self._validate_value(text, field_name, texts_stripped[i]):
                 value_text = text
                 value_confidence = ocr_data["confidence"][i]
+                # NumPy scalars become plain Python numbers (JSON-safe);
+                # list input is returned as given
+                if isinstance(value_confidence, np.generic):
+                    value_confidence = value_confidence.item()
                 break
         
         if value_text is None:
@@ -146,30 +202,37 @@ class RuleBasedParser:
             "confidence": value_confidence
         }
     
-    def _find_label(self, label_keywords: List[str], ocr_data: Dict) -> int:
+    def _find_labels(self, texts_lower, is_label: np.ndarray) -> Dict[str, int]:
         """
-        Find the index of label text in OCR data.
+        Find the label index of every field in a single pass over OCR words.
+        
+        Each field gets the first label-like word matching one of its
+        keywords; the sweep stops early once every field has a label.
         
         Args:
-            label_keywords (list): Possible label keywords
-            ocr_data (dict): OCR data
+            texts_lower: Lower-cased OCR texts
+            is_label (ndarray): Per-word _is_label_text() results
         
         Returns:
-            int: Index of label or None
+            dict: {field_name: label_index} for fields whose label was found
         """
-        for i, text in enumerate(ocr_data["text"]):
-            text_lower = text.lower()
+        label_indices = {}
+        remaining = dict(self._label_patterns)
+        
+        # Only label-like words can be labels; most words are values
+        for i in np.nonzero(is_label)[0]:
+            text = texts_lower[i]
+            for field_name, label_pattern in list(remaining.items()):
+                if label_pattern.search(text):
+                    label_indices[field_name] = i
+                    del remaining[field_name]
             
-            # Check if any label keyword matches
-            for keyword in label_keywords:
-                if keyword in text_lower:
-                    # Ensure it's actually a label (high position or ends with colon)
-                    if self._is_label_text(text):
-                        return i
-        
-        return None
+            if not remaining:
+                break
+        
+        return label_indices
     
-    def _is_label_text(self, text: str) -> bool:
+    def _is_label_text(self, text: str, text_lower: str = None) -> bool:
         """
         Check if text is likely a label (not a value).
         
@@ -180,6 +243,7 @@ class RuleBasedParser:
         
         Args:
             text (str): Text to check
+            text_lower (str): Precomputed text.lower(), if available
         
         Returns:
             bool: True if text looks like a label
@@ -189,7 +253,9 @@ class RuleBasedParser:
             return True
         
         # In label keywords set
-        if text.lower() in self.all_label_keywords:
+        if text_lower is None:
+            text_lower = text.lower()
+        if text_lower in self.all_label_keywords:
             return True
         
         # Short text with mostly uppercase (likely label)
@@ -198,38 +264,42 @@ class RuleBasedParser:
         
         return False
     
-    def _validate_value(self, text: str, field_type: str) -> bool:
+    def _validate_value(self, text: str, field_type: str, stripped: str = None) -> bool:
         """
         Validate extracted value based on field type.
         
         Args:
             text (str): Text to validate
             field_type (str): Type of field (e.g., "Student Name", "Contact")
+            stripped (str): Precomputed text.strip(), if available
         
         Returns:
             bool: True if value is valid
         """
+        if stripped is None:
+            stripped = text.strip()
+        
         # Skip empty or whitespace-only text
-        if not text or not text.strip():
+        if not text or not stripped:
             return False
         
         # Skip very short text (likely noise)
-        if len(text.strip()) < 2:
+        if len(stripped) < 2:
             return False
         
         # Name fields - should be mostly alphabetic
         if "Name" in field_type:
             # Allow letters, spaces, hyphens, apostrophes
-            if not re.search(r'^[a-zA-Z\s\-\']+$', text):
+            if not _full_match(_NAME_RE, _NAME_RE_B, text):
                 return False
             return len(text) > 2
         
         # Phone/Contact fields - should be mostly digits
         if any(x in field_type.lower() for x in ["contact", "phone", "mobile", "number"]):
             # Allow digits, spaces, hyphens, parentheses, +
-            if not re.search(r'^[0-9\s\-\+\(\)]+$', text):
+            if not _full_match(_PHONE_RE, _PHONE_RE_B, text):
                 return False
-            return len(re.findall(r'\d', text)) >= 7  # At least 7 digits
+            return len(_DIGIT_RE.findall(text)) >= 7  # At least 7 digits
         
         # Email fields
         if "Email" in field_type:
@@ -240,20 +310,20 @@ class RuleBasedParser:
         # Date fields
         if "Date" in field_type or "Birth" in field_type:
             # Should contain digits and separators
-            if not re.search(r'\d{1,4}[-/\.]\d{1,2}[-/\.]\d{1,4}', text):
+            if not _DATE_RE.search(text):
                 return False
             return True
         
         # Marks/Score fields - should be numeric or percentage
         if "Marks" in field_type or "Score" in field_type or "Percentage" in field_type:
             # Allow digits, decimal point, percentage sign
-            if not re.search(r'^[\d\.%\s]+$', text):
+            if not _full_match(_MARKS_RE, _MARKS_RE_B, text):
                 return False
-            return len(re.findall(r'\d', text)) >= 1
+            return _DIGIT_RE.search(text) is not None
         
         # Address, City, School, etc. - accept as is if not empty
         if any(x in field_type for x in ["Address", "City", "School", "Group"]):
-            return len(text.strip()) > 1
+            return len(stripped) > 1
         
         # For unknown types, accept if not all digits or all special chars
         if text and any(c.isalnum() for c in text):
@@ -1,21 +1,317 @@
 """
 Image Preprocessing Module
 Converts raw camera/uploaded images to clean, readable documents.
-Uses only light preprocessing: grayscale + adaptive threshold.
+Uses only light preprocessing: grayscale + bilateral denoise + CLAHE +
+Otsu threshold (adaptive threshold with binarization="adaptive").
 NO edge detection, NO contour detection - keeps it simple and safe.
 """
 
+import logging
+import threading
 import cv2
 import numpy as np
 
 
+logger = logging.getLogger(__name__)
+
+
+# CUDA path needs an OpenCV build with the cuda modules and a visible GPU
+try:
+    _HAS_CUDA = cv2.cuda.getCudaEnabledDeviceCount() > 0
+except Exception:
+    _HAS_CUDA = False
+
+# Otsu's threshold is picked from every _OTSU_STEP-th row/column; the
+# histogram shape it depends on is unaffected by subsampling
+_OTSU_STEP = 4
+
+
+def _to_gray(image, dst=None):
+    """
+    Convert a BGR/BGRA/grayscale image to single-channel grayscale.
+    
+    Args:
+        image (ndarray): Input image
+        dst (ndarray): Optional output buffer of matching shape
+    
+    Returns:
+        ndarray: Grayscale image (the input itself if already grayscale)
+    """
+    if image.ndim == 2:
+        return image
+    if image.shape[2] == 1:
+        return image[:, :, 0]
+    code = cv2.COLOR_BGRA2GRAY if image.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+    return cv2.cvtColor(image, code, dst=dst)
+
+
+class FastCLAHE:
+    """
+    Vectorized NumPy CLAHE for 8-bit grayscale images.
+    
+    With the default bsb=False this reproduces cv2.createCLAHE(...).apply
+    bit for bit: the clip limit is
+    truncated to a whole pixel count, each tile histogram is clipped once,
+    and the excess is spread uniformly with OpenCV's residual step. That
+    single pass can push bins back over the limit. LUT scaling and tile
+    blending use OpenCV's float32 arithmetic and rounding.
+    
+    bsb=True switches to binary-search-based (BSB) clipping: it searches the
+    clip point T at which clipping at T and redistributing the excess lands
+    exactly on the limit, so no bin ends up above it. Wherever OpenCV's
+    redistribution would overshoot (low clip limits, small tiles), BSB
+    therefore stretches contrast less than OpenCV; the two agree when
+    clipping never triggers.
+    """
+    
+    def __init__(self, clip_limit=2.0, tile_grid_size=(8, 8), bsb=False):
+        """
+        Args:
+            clip_limit (float): Contrast limit, same scale as OpenCV's clipLimit
+                (<= 0 disables clipping)
+            tile_grid_size (tuple): (tiles_x, tiles_y)
+            bsb (bool): Clip with BSB instead of OpenCV's single pass
+        """
+        self.clip_limit = clip_limit
+        self.tiles_x, self.tiles_y = tile_grid_size
+        self.bsb = bsb
+        
+        # Tile geometry per image shape: (tile_h, tile_w, padded tile ids),
+        # plus the blend offsets/weights under ("blend", shape)
+        self._grid_cache = {}
+    
+    def _tile_grid(self, shape):
+        """Return (tile_h, tile_w, tile index per padded pixel) for an image shape."""
+        grid = self._grid_cache.get(shape)
+        if grid is None:
+            height, width = shape
+            tile_h = -(-height // self.tiles_y)
+            tile_w = -(-width // self.tiles_x)
+            rows = np.arange(tile_h * self.tiles_y) // tile_h
+            cols = np.arange(tile_w * self.tiles_x) // tile_w
+            tile_ids = (rows[:, None] * self.tiles_x + cols[None, :]) * 256
+            grid = (tile_h, tile_w, tile_ids)
+            self._grid_cache[shape] = grid
+        return grid
+    
+    def _blend_grid(self, shape):
+        """
+        Per-row/column LUT offsets and weights for bilinear tile blending.
+        
+        Offsets index the flattened (tiles_y, tiles_x, 256) LUT array; rows
+        are (H, 1) and columns (1, W) so they broadcast over the image.
+        
+        Returns:
+            tuple: (rows_a, rows_b, wy, cols_a, cols_b, wx)
+        """
+        key = ("blend", shape)
+        grid = self._grid_cache.get(key)
+        if grid is None:
+            height, width = shape
+            tile_h, tile_w, _ = self._tile_grid(shape)
+            
+            # Tile-centre coordinates of every row/column, in float32 like
+            # OpenCV (x * (1 / tile_w) - 0.5)
+            ty = np.arange(height, dtype=np.float32) * (np.float32(1) / np.float32(tile_h)) - np.float32(0.5)
+            tx = np.arange(width, dtype=np.float32) * (np.float32(1) / np.float32(tile_w)) - np.float32(0.5)
+            ty1 = np.floor(ty).astype(np.intp)
+            tx1 = np.floor(tx).astype(np.intp)
+            wy = (ty - ty1).astype(np.float32)[:, None]
+            wx = (tx - tx1).astype(np.float32)[None, :]
+            ty2 = np.minimum(ty1 + 1, self.tiles_y - 1)
+            tx2 = np.minimum(tx1 + 1, self.tiles_x - 1)
+            ty1 = np.maximum(ty1, 0)
+            tx1 = np.maximum(tx1, 0)
+            
+            row_stride = self.tiles_x * 256
+            grid = (
+                (ty1 * row_stride)[:, None], (ty2 * row_stride)[:, None], wy,
+                (tx1 * 256)[None, :], (tx2 * 256)[None, :], wx,
+            )
+            self._grid_cache[key] = grid
+        return grid
+    
+    def _tile_luts(self, src):
+        """
+        Build the clipped, equalized LUT of every tile.
+        
+        Args:
+            src (ndarray): 8-bit grayscale image
+        
+        Returns:
+            ndarray: (tiles_y, tiles_x, 256) uint8 LUTs
+        """
+        height, width = src.shape
+        tile_h, tile_w, tile_ids = self._tile_grid(src.shape)
+        tile_area = tile_h * tile_w
+        n_tiles = self.tiles_x * self.tiles_y
+        
+        # Pad to a whole number of tiles the way OpenCV does
+        padded = cv2.copyMakeBorder(
+            src, 0, tile_ids.shape[0] - height, 0, tile_ids.shape[1] - width,
+            cv2.BORDER_REFLECT_101
+        )
+        
+        # All tile histograms in one bincount: bin = tile * 256 + value
+        hist = np.bincount(
+            (tile_ids + padded).ravel(), minlength=n_tiles * 256
+        ).reshape(n_tiles, 256)
+        
+        if self.clip_limit > 0:
+            # OpenCV truncates the limit to a whole pixel count
+            limit = max(int(self.clip_limit * tile_area / 256.0), 1)
+            hist = self._clip_bsb(hist, limit) if self.bsb else self._clip_opencv(hist, limit)
+        
+        # float32 LUT scaling and round-half-even, as OpenCV's saturate_cast
+        cdf = np.cumsum(hist, axis=1).astype(np.float32)
+        luts = np.clip(np.rint(cdf * (np.float32(255.0) / np.float32(tile_area))), 0, 255)
+        luts = luts.astype(np.uint8)
+        return luts.reshape(self.tiles_y, self.tiles_x, 256)
+    
+    @staticmethod
+    def _clip_opencv(hist, limit):
+        """
+        Clip tile histograms the way OpenCV's CLAHE does.
+        
+        Bins are cut at the limit; the excess is added uniformly
+        (excess // 256 per bin) and the remaining excess % 256 pixels go one
+        each to bins 0, step, 2*step, ... with step = max(256 // residual, 1).
+        
+        Args:
+            hist (ndarray): (n_tiles, 256) integer histograms
+            limit (int): Clip limit in pixels
+        
+        Returns:
+            ndarray: Clipped histograms
+        """
+        excess = np.maximum(hist - limit, 0).sum(axis=1, keepdims=True)
+        batch, residual = np.divmod(excess, 256)
+        step = np.maximum(256 // np.maximum(residual, 1), 1)
+        bins = np.arange(256)[None, :]
+        gets_residual = (bins % step == 0) & (bins // step < residual)
+        return np.minimum(hist, limit) + batch + gets_residual
+    
+    @staticmethod
+    def _clip_bsb(hist, limit):
+        """
+        Clip tile histograms so that after redistribution no bin exceeds limit.
+        
+        f(T) = T + excess(T) / 256 grows with T; a vectorized binary search
+        over all tiles finds f(T) = limit in ~log2(limit) passes.
+        
+        Args:
+            hist (ndarray): (n_tiles, 256) integer histograms
+            limit (int): Clip limit in pixels
+        
+        Returns:
+            ndarray: Clipped histograms (float)
+        """
+        hist = hist.astype(np.float64)
+        low = np.zeros((hist.shape[0], 1))
+        high = np.full((hist.shape[0], 1), float(limit))
+        for _ in range(max(1, int(np.ceil(np.log2(limit + 1))) + 8)):
+            mid = (low + high) / 2
+            excess = np.maximum(hist - mid, 0).sum(axis=1, keepdims=True)
+            too_high = mid + excess / 256.0 > limit
+            high = np.where(too_high, mid, high)
+            low = np.where(too_high, low, mid)
+        
+        excess = np.maximum(hist - low, 0).sum(axis=1, keepdims=True)
+        return np.minimum(hist, low) + excess / 256.0
+    
+    def apply(self, src, dst=None):
+        """
+        Equalize an image, bilinearly blending the four nearest tile LUTs.
+        
+        Args:
+            src (ndarray): 8-bit grayscale image
+            dst (ndarray): Optional output buffer (may be src)
+        
+        Returns:
+            ndarray: Contrast-enhanced image
+        """
+        luts = self._tile_luts(src).reshape(-1)
+        if dst is None:
+            dst = np.empty_like(src)
+        
+        # 4 gathers from the flattened (tiles_y, tiles_x, 256) LUTs and one
+        # bilinear blend, each a single vectorized pass over the image
+        rows_a, rows_b, wy, cols_a, cols_b, wx = self._blend_grid(src.shape)
+        value = src.astype(np.intp)
+        top_a = luts.take(rows_a + cols_a + value)
+        top_b = luts.take(rows_a + cols_b + value)
+        bottom_a = luts.take(rows_b + cols_a + value)
+        bottom_b = luts.take(rows_b + cols_b + value)
+        
+        # Same float32 expression order as OpenCV's interpolation
+        one = np.float32(1)
+        top = top_a * (one - wx) + top_b * wx
+        bottom = bottom_a * (one - wx) + bottom_b * wx
+        np.rint(top * (one - wy) + bottom * wy, out=top)
+        dst[...] = top
+        
+        return dst
+
+
 class ImagePreprocessor:
-    """Handles safe, lightweight image preprocessing for OCR."""
+    """
+    Handles safe, lightweight image preprocessing for OCR.
     
-    def __init__(self):
-        """Initialize preprocessor with safe default parameters."""
+    CPU preprocessing is thread-safe: each thread gets its own CLAHE
+    object and scratch buffers. The CUDA path shares its GPU filters, so
+    use one preprocessor per thread with device="cuda".
+    """
+    
+    def __init__(self, max_dim=1600, keep_full_res=False, bsb_clahe=False,
+                 device="cpu", binarization="otsu"):
+        """
+        Initialize preprocessor with safe default parameters.
+        
+        Args:
+            max_dim (int): Long-edge limit (px) for the filtering stages;
+                larger images are filtered downscaled, the mask is upscaled
+            keep_full_res (bool): Filter at the original resolution instead
+            bsb_clahe (bool): Use FastCLAHE (BSB clipping) instead of OpenCV's
+                CLAHE; bins never end up above the clip limit, so low-contrast
+                regions are stretched slightly less
+            device (str): "cuda" runs the whole pipeline on the GPU when
+                OpenCV was built with CUDA (falls back to "cpu" otherwise)
+            binarization (str): "otsu" - one global threshold (CLAHE has
+                already evened out local lighting), or "adaptive" - Gaussian
+                15x15 local threshold
+        """
         self.block_size = 11  # Neighborhood size for adaptive threshold (must be odd)
         self.constant = 2     # Constant subtracted in adaptive threshold
+        self.max_dim = max_dim
+        self.keep_full_res = keep_full_res
+        self.binarization = binarization
+        
+        # CLAHE objects keep scratch state between apply() calls, so each
+        # thread builds one from this factory and reuses it for every image
+        if bsb_clahe:
+            self._new_clahe = lambda: FastCLAHE(clip_limit=2.0, tile_grid_size=(8, 8), bsb=True)
+        else:
+            self._new_clahe = lambda: cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+        
+        # Per-thread CLAHE object and intermediate buffers by role (see
+        # _thread_state); buffers are reused while consecutive images share
+        # a size, the returned mask always gets fresh memory
+        self._local = threading.local()
+        
+        # Separable Gaussian weights of the adaptive threshold (blockSize 15,
+        # sigma derived from the size as adaptiveThreshold does), built once
+        self._threshold_kernel = cv2.getGaussianKernel(15, -1)
+        
+        self.device = "cuda" if device == "cuda" and _HAS_CUDA else "cpu"
+        if device == "cuda" and self.device != "cuda":
+            logger.warning("⚠ CUDA not available in this OpenCV build, preprocessing on CPU")
+        if self.device == "cuda":
+            self._cuda_clahe = cv2.cuda.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+            # Gaussian-weighted local mean of adaptiveThreshold (blockSize 15)
+            self._cuda_mean = cv2.cuda.createGaussianFilter(
+                cv2.CV_8U, cv2.CV_8U, (15, 15), 0, 0, cv2.BORDER_REPLICATE, cv2.BORDER_REPLICATE
+            )
+            self._cuda_offset = None
     
     def preprocess(self, image):
         """
@@ -25,7 +321,7 @@ class ImagePreprocessor:
         1. Convert to grayscale
         2. Apply denoising (bilateral filter)
         3. Enhance contrast with CLAHE
-        4. Apply adaptive thresholding
+        4. Binarize (Otsu global threshold, or adaptive thresholding)
         
         Args:
             image (ndarray): Input image in BGR format from OpenCV
@@ -35,45 +331,216 @@ class ImagePreprocessor:
         """
         try:
             if image is None:
-                print("❌ ERROR: Input image is None")
+                logger.error("❌ ERROR: Input image is None")
                 return None
             
-            # Step 1: Convert to grayscale
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            print("✓ Converted to grayscale")
+            if self.device == "cuda":
+                try:
+                    return self._preprocess_cuda(image)
+                except cv2.error as e:
+                    logger.warning("⚠ CUDA preprocessing failed (%s), using CPU", e)
             
-            # Step 2: Denoise (reduce noise while preserving edges)
-            # Bilateral filter: great for handwritten text
-            denoised = cv2.bilateralFilter(gray, 9, 75, 75)
-            print("✓ Applied denoising")
+            # Step 1: Convert to grayscale (skipped for already-gray input)
+            if image.ndim == 3 and image.shape[2] in (3, 4):
+                gray = _to_gray(image, dst=self._buffer("gray", image.shape[:2], image.dtype))
+            else:
+                gray = _to_gray(image)
+            logger.debug("✓ Converted to grayscale")
             
-            # Step 3: Enhance contrast with CLAHE (Contrast Limited Adaptive Histogram Equalization)
-            # This helps with faded or low-contrast handwriting
-            clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-            enhanced = clahe.apply(denoised)
-            print("✓ Enhanced contrast for handwriting")
+            # Binarization doesn't need full sensor resolution: filter a
+            # downscaled copy of large images and upscale the final mask
+            height, width = gray.shape[:2]
+            scale = 1.0 if self.keep_full_res else min(1.0, self.max_dim / max(height, width))
+            if scale < 1.0:
+                small_shape = (max(1, round(height * scale)), max(1, round(width * scale)))
+                gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA,
+                                  dst=self._buffer("small", small_shape, gray.dtype))
+                logger.debug("✓ Downscaled to %dx%d for filtering", gray.shape[1], gray.shape[0])
             
-            # Step 4: Apply adaptive thresholding with larger block for handwritten text
-            processed = cv2.adaptiveThreshold(
-                enhanced,
-                255,                                  # Maximum value (white)
-                cv2.ADAPTIVE_THRESH_GAUSSIAN_C,       # Adaptive method
-                cv2.THRESH_BINARY,                    # Thresholding method
-                blockSize=15,                         # Larger block for handwriting
-                C=3                                   # Adjusted constant
+            # Step 2: Denoise (reduce noise while preserving edges).
+            # Steps 3-4 run in place on this buffer, so it is only recycled
+            # when the mask is upscaled into a new array afterwards
+            denoised = self._denoise(
+                gray, dst=self._buffer("denoised", gray.shape, gray.dtype) if scale < 1.0 else None
             )
-            print("✓ Applied adaptive thresholding")
+            logger.debug("✓ Applied denoising")
+            
+            # Step 3: Enhance contrast with CLAHE (Contrast Limited Adaptive Histogram Equalization)
+            # This helps with faded or low-contrast handwriting.
+            # Steps 3 and 4 are per-pixel after their LUT/blur setup, so they
+            # run in place on the denoised buffer instead of allocating new ones
+            enhanced = self._thread_state().clahe.apply(denoised, dst=denoised)
+            logger.debug("✓ Enhanced contrast for handwriting")
+            
+            # Step 4: Binarize
+            if self.binarization == "otsu":
+                threshold = self._otsu_threshold(enhanced)
+                processed = cv2.threshold(enhanced, threshold, 255, cv2.THRESH_BINARY, dst=enhanced)[1]
+                logger.debug("✓ Applied Otsu thresholding (t=%d)", threshold)
+            else:
+                # Adaptive thresholding with larger block for handwritten text
+                # (Gaussian-weighted 15x15 local mean, C=3; same result as
+                # cv2.adaptiveThreshold(..., ADAPTIVE_THRESH_GAUSSIAN_C, THRESH_BINARY))
+                processed = self._adaptive_threshold(enhanced)
+                logger.debug("✓ Applied adaptive thresholding")
+            
+            if scale < 1.0:
+                processed = cv2.resize(processed, (width, height), interpolation=cv2.INTER_NEAREST)
             
             return processed
             
         except Exception as e:
-            print(f"❌ ERROR during preprocessing: {e}")
-            print("⚠ Returning original grayscale image as fallback")
+            logger.error("❌ ERROR during preprocessing: %s", e)
+            logger.warning("⚠ Returning original grayscale image as fallback")
             try:
-                return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+                return _to_gray(image).copy()
             except:
                 return None
     
+    def _thread_state(self):
+        """
+        Return the calling thread's CLAHE object and buffers, creating them on first use.
+        
+        Returns:
+            threading.local: Namespace with clahe and buffers ({role: ndarray})
+        """
+        state = self._local
+        if not hasattr(state, "buffers"):
+            state.clahe = self._new_clahe()
+            state.buffers = {}
+        return state
+    
+    def _buffer(self, role, shape, dtype=np.uint8):
+        """
+        Return this thread's scratch array for a role, reallocating on size change.
+        
+        Args:
+            role (str): Buffer name ("gray", "small", ...)
+            shape (tuple): Required shape
+            dtype: Required dtype
+        
+        Returns:
+            ndarray: Uninitialized array of the requested shape and dtype
+        """
+        buffers = self._thread_state().buffers
+        buf = buffers.get(role)
+        if buf is None or buf.shape != tuple(shape) or buf.dtype != dtype:
+            buf = np.empty(shape, dtype=dtype)
+            buffers[role] = buf
+        return buf
+    
+    @staticmethod
+    def _otsu_threshold(gray):
+        """
+        Otsu's global threshold, computed on a subsampled view of the image.
+        
+        Args:
+            gray (ndarray): 8-bit grayscale image
+        
+        Returns:
+            float: Threshold (pixels above it become white)
+        """
+        sample = np.ascontiguousarray(gray[::_OTSU_STEP, ::_OTSU_STEP])
+        threshold, _ = cv2.threshold(sample, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+        return threshold
+    
+    def _adaptive_threshold(self, enhanced):
+        """
+        Gaussian adaptive threshold with the cached separable kernel.
+        
+        White where pixel - local_mean > -3, computed in place as the
+        saturating pixel + 2 >= local_mean (exact for 8-bit values).
+        
+        Args:
+            enhanced (ndarray): Contrast-enhanced grayscale image (overwritten)
+        
+        Returns:
+            ndarray: Binary image (the enhanced buffer)
+        """
+        local_mean = cv2.sepFilter2D(
+            enhanced, cv2.CV_8U, self._threshold_kernel, self._threshold_kernel,
+            dst=self._buffer("local_mean", enhanced.shape), borderType=cv2.BORDER_REPLICATE
+        )
+        cv2.add(enhanced, 2, dst=enhanced)
+        return cv2.compare(enhanced, local_mean, cv2.CMP_GE, dst=enhanced)
+    
+    def _preprocess_cuda(self, image):
+        """
+        Run the preprocessing pipeline end-to-end on the GPU.
+        
+        The image is uploaded once and only the final binary mask is
+        downloaded; same steps and parameters as the CPU path.
+        
+        Args:
+            image (ndarray): Input image (BGR, BGRA or grayscale)
+        
+        Returns:
+            ndarray: Preprocessed binary image ready for OCR
+        """
+        gpu = cv2.cuda_GpuMat()
+        gpu.upload(image)
+        
+        # Step 1: Convert to grayscale
+        if image.ndim == 3 and image.shape[2] in (3, 4):
+            code = cv2.COLOR_BGRA2GRAY if image.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+            gpu = cv2.cuda.cvtColor(gpu, code)
+        logger.debug("✓ Converted to grayscale (GPU)")
+        
+        height, width = image.shape[:2]
+        scale = 1.0 if self.keep_full_res else min(1.0, self.max_dim / max(height, width))
+        if scale < 1.0:
+            size = (max(1, round(width * scale)), max(1, round(height * scale)))
+            gpu = cv2.cuda.resize(gpu, size, interpolation=cv2.INTER_AREA)
+        
+        # Step 2: Denoise
+        gpu = cv2.cuda.bilateralFilter(gpu, 9, 75, 75)
+        logger.debug("✓ Applied denoising (GPU)")
+        
+        # Step 3: Enhance contrast with CLAHE
+        enhanced = self._cuda_clahe.apply(gpu, cv2.cuda.Stream_Null())
+        logger.debug("✓ Enhanced contrast for handwriting (GPU)")
+        
+        # Step 4: Binarize
+        if self.binarization == "otsu":
+            # Threshold picked from a small downloaded copy, applied on the GPU
+            cols, rows = enhanced.size()
+            sample_size = (max(1, cols // _OTSU_STEP), max(1, rows // _OTSU_STEP))
+            sample = cv2.cuda.resize(enhanced, sample_size, interpolation=cv2.INTER_NEAREST)
+            threshold = self._otsu_threshold(sample.download())
+            _, processed = cv2.cuda.threshold(enhanced, threshold, 255, cv2.THRESH_BINARY)
+            logger.debug("✓ Applied Otsu thresholding (GPU, t=%d)", threshold)
+        else:
+            # Adaptive threshold, C=3: white where src - mean > -3,
+            # i.e. src + 2 >= mean (saturating add stays exact at 255)
+            mean = self._cuda_mean.apply(enhanced)
+            rows, cols = enhanced.size()[1], enhanced.size()[0]
+            if self._cuda_offset is None or self._cuda_offset.size() != enhanced.size():
+                self._cuda_offset = cv2.cuda_GpuMat(rows, cols, cv2.CV_8U, (2,))
+            shifted = cv2.cuda.add(enhanced, self._cuda_offset)
+            processed = cv2.cuda.compare(shifted, mean, cv2.CMP_GE)
+            logger.debug("✓ Applied adaptive thresholding (GPU)")
+        
+        if scale < 1.0:
+            processed = cv2.cuda.resize(processed, (width, height), interpolation=cv2.INTER_NEAREST)
+        
+        return processed.download()
+    
+    def _denoise(self, gray, dst=None):
+        """
+        Edge-preserving smoothing of a grayscale image.
+        
+        Bilateral filter (9px, sigma 75) - great for handwritten text.
+        OpenCV already spreads it over its own thread pool.
+        
+        Args:
+            gray (ndarray): Grayscale image
+            dst (ndarray): Optional output buffer of the same shape
+        
+        Returns:
+            ndarray: Denoised grayscale image
+        """
+        return cv2.bilateralFilter(gray, 9, 75, 75, dst=dst)
+    
     def save_processed_image(self, image, output_path):
         """
         Save preprocessed image to disk.
@@ -87,19 +554,19 @@ class ImagePreprocessor:
         """
         try:
             if image is None:
-                print("❌ ERROR: Cannot save - image is None")
+                logger.error("❌ ERROR: Cannot save - image is None")
                 return False
             
             success = cv2.imwrite(output_path, image)
             if success:
-                print(f"✓ Processed image saved: {output_path}")
+                logger.debug("✓ Processed image saved: %s", output_path)
                 return True
             else:
-                print(f"❌ ERROR: Failed to save image to {output_path}")
+                logger.error("❌ ERROR: Failed to save image to %s", output_path)
                 return False
                 
         except Exception as e:
-            print(f"❌ ERROR saving processed image: {e}")
+            logger.error("❌ ERROR saving processed image: %s", e)
             return False
     
     @staticmethod
@@ -129,5 +596,5 @@ class ImagePreprocessor:
             "size_bytes": image.nbytes
         }
         
-        print(f"📐 Image Info: {width}x{height} pixels, {channels} channel(s)")
+        logger.debug("📐 Image Info: %dx%d pixels, %d channel(s)", width, height, channels)
         return info
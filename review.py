@@ -4,21 +4,121 @@ Mandatory user review and correction interface.
 Shows extracted fields with confidence, allows edits, prevents blind auto-saving.
 """
 
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
+from parser_rule_based import RuleBasedParser
+
+
+# Marks "no pre-supplied decision" (None is a valid format decision: don't save)
+_ASK = object()
+
+# Output format chosen when auto-accepting without a "format" decision
+_DEFAULT_FORMAT = "excel"
+
+# Allowed pre-supplied answers (None as a format means: don't save)
+_CONFIRM_CHOICES = ("accept", "edit", "cancel")
+_FORMAT_CHOICES = ("excel", "json", "csv", None)
+_DECISION_KEYS = ("confirm", "edits", "format", "filename")
+
 
 class FieldReviewer:
     """Interactive review of extracted data with validation and correction."""
     
+    def __init__(self, auto_accept: bool = False, decisions: Optional[Dict] = None):
+        """
+        Initialize reviewer.
+        
+        Pre-supplied decisions replace the matching input() prompt, so
+        documents can be processed headless (batch/server use):
+            {"confirm": "accept", "edits": {"Field": "new value"},
+             "format": "json", "filename": "form_001"}
+        
+        Args:
+            auto_accept (bool): Never prompt; anything not in decisions takes
+                its default (accept, no edits, Excel, default filename)
+            decisions (dict): Answers for some or all of the prompts
+        
+        Raises:
+            ValueError: If a decision key or value is not one of the choices
+        """
+        self.auto_accept = auto_accept
+        self.decisions = self._normalize_decisions(decisions or {})
+        # Set once the current document's fields were edited
+        self._edits_applied = False
+    
     @staticmethod
-    def display_fields_for_review(extracted_data: Dict, parser_type: str = "Unknown") -> None:
+    def _normalize_decisions(decisions: Dict) -> Dict:
+        """
+        Validate pre-supplied decisions and normalize their case.
+        
+        Args:
+            decisions (dict): Answers keyed by decision name
+        
+        Returns:
+            dict: Copy with "confirm"/"format" lower-cased and stripped
+        
+        Raises:
+            ValueError: On an unknown key or an invalid value
+        """
+        unknown = set(decisions) - set(_DECISION_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown review decision(s): {', '.join(sorted(unknown))}")
+        
+        normalized = dict(decisions)
+        if "confirm" in normalized:
+            confirm = str(normalized["confirm"]).strip().lower()
+            if confirm not in _CONFIRM_CHOICES:
+                raise ValueError(f"Invalid confirm decision {normalized['confirm']!r}; "
+                                 f"expected one of {', '.join(_CONFIRM_CHOICES)}")
+            normalized["confirm"] = confirm
+        if "format" in normalized:
+            fmt = normalized["format"]
+            fmt = fmt.strip().lower() if isinstance(fmt, str) else fmt
+            if fmt not in _FORMAT_CHOICES:
+                raise ValueError(f"Invalid format decision {normalized['format']!r}; "
+                                 "expected excel, json, csv or None")
+            normalized["format"] = fmt
+        if "edits" in normalized:
+            if not isinstance(normalized["edits"], dict):
+                raise ValueError("The edits decision must be a dict of field -> value")
+            # Checked against every field the parser knows, not one document's
+            # fields: a shared reviewer sees documents missing some fields
+            unknown = set(normalized["edits"]) - set(RuleBasedParser.FIELD_LABELS)
+            if unknown:
+                raise ValueError(f"Unknown field(s) in edits: {', '.join(sorted(unknown))}")
+        if "filename" in normalized and not isinstance(normalized["filename"], str):
+            raise ValueError("The filename decision must be a string")
+        return normalized
+    
+    def _decision(self, key: str, default):
+        """
+        Look up a pre-supplied answer.
+        
+        Args:
+            key (str): Decision name ("confirm", "edits", "format", "filename")
+            default: Answer used when auto-accepting
+        
+        Returns:
+            The decision, the default in auto-accept mode, or _ASK to prompt
+        """
+        if key in self.decisions:
+            return self.decisions[key]
+        if self.auto_accept:
+            return default
+        return _ASK
+    
+    @staticmethod
+    def display_fields_for_review(extracted_data: Dict, parser_type: str = "Unknown",
+                                  sorted_keys: Optional[List[str]] = None) -> None:
         """
         Display extracted fields in user-friendly format.
         
         Args:
             extracted_data (dict): Extracted fields with values and confidence
             parser_type (str): Type of parser used ("Rule-Based" or "OpenAI")
+            sorted_keys (list): Field display order, if the caller already
+                sorted it (e.g. the order used in edit mode)
         """
         print("\n" + "="*80)
         print("👀 PLEASE REVIEW THE EXTRACTED DATA")
@@ -32,9 +132,11 @@ class FieldReviewer:
             return
         
         # Sort fields by name for consistent display
-        sorted_fields = sorted(extracted_data.items())
+        if sorted_keys is None:
+            sorted_keys = sorted(extracted_data)
         
-        for idx, (field_name, field_data) in enumerate(sorted_fields, 1):
+        for idx, field_name in enumerate(sorted_keys, 1):
+            field_data = extracted_data[field_name]
             value = field_data.get("value", "")
             confidence = field_data.get("confidence", 0)
             
@@ -56,15 +158,26 @@ class FieldReviewer:
         
         print("="*80)
     
-    @staticmethod
-    def get_user_confirmation() -> str:
+    def get_user_confirmation(self) -> str:
         """
         Ask user to accept, edit, or cancel.
-        NEVER auto-save - always require explicit user action.
+        NEVER auto-save - always require explicit user action
+        (a "confirm" decision or auto_accept counts as that action).
         
         Returns:
             str: 'accept', 'edit', or 'cancel'
         """
+        decision = self._decision("confirm", "accept")
+        if decision is not _ASK:
+            if decision == "edit" and self._edits_applied:
+                # The pre-supplied edits are applied once; the edited data is accepted
+                decision = "accept"
+            if decision != "edit":
+                # Review of this document ends here; the next one edits again
+                self._edits_applied = False
+            print(f"✓ Pre-supplied choice: {decision}")
+            return decision
+        
         while True:
             print("\nOptions:")
             print("  [A] Accept - Use extracted data as-is")
@@ -86,8 +199,7 @@ class FieldReviewer:
             else:
                 print("❌ Invalid choice. Please enter A, E, or C")
     
-    @staticmethod
-    def get_field_edits(extracted_data: Dict) -> Dict:
+    def get_field_edits(self, extracted_data: Dict) -> Dict:
         """
         Allow user to edit specific fields interactively.
         
@@ -95,35 +207,51 @@ class FieldReviewer:
             extracted_data (dict): Current extracted fields
         
         Returns:
-            dict: Updated fields (with manually edited fields marked as 100% confidence)
+            dict: Updated fields (with manually edited fields marked as 100% confidence);
+                extracted_data itself is left unchanged
         """
         updated_data = extracted_data.copy()
         
+        edits = self._decision("edits", {})
+        if edits is not _ASK:
+            for field_name, new_value in edits.items():
+                if field_name in updated_data and new_value:
+                    # New field dict, so the caller's copy keeps the OCR value;
+                    # manually edited fields are marked with 100% confidence
+                    updated_data[field_name] = {**updated_data[field_name],
+                                                "value": new_value, "confidence": 100}
+                    print(f"✓ Updated '{field_name}' to '{new_value}'")
+            self._edits_applied = True
+            return updated_data
+        
+        # Fields are only edited, never added, so the order is fixed
+        sorted_keys = sorted(updated_data)
+        
         while True:
             print("\n" + "-"*80)
             print("EDIT MODE - Select fields to modify")
             print("-"*80)
             
             # Display current fields with numbers
-            sorted_fields = sorted(updated_data.items())
-            for idx, (field_name, field_data) in enumerate(sorted_fields, 1):
+            for idx, field_name in enumerate(sorted_keys, 1):
+                field_data = updated_data[field_name]
                 value = field_data.get("value", "")
                 conf = field_data.get("confidence", 0)
                 print(f"{idx}. {field_name}: {value} (confidence: {conf}%)")
             
-            print(f"{len(sorted_fields) + 1}. Done editing")
+            print(f"{len(sorted_keys) + 1}. Done editing")
             print()
             
             try:
                 choice = input("Enter field number to edit (or Enter 'Done'): ").strip()
                 
-                if choice.lower() == "done" or choice == str(len(sorted_fields) + 1):
+                if choice.lower() == "done" or choice == str(len(sorted_keys) + 1):
                     print("✓ Done editing")
                     break
                 
                 field_idx = int(choice) - 1
-                if 0 <= field_idx < len(sorted_fields):
-                    field_name = sorted_fields[field_idx][0]
+                if 0 <= field_idx < len(sorted_keys):
+                    field_name = sorted_keys[field_idx]
                     
                     print(f"\nEditing: {field_name}")
                     current_value = updated_data[field_name].get("value", "")
@@ -132,9 +260,9 @@ class FieldReviewer:
                     new_value = input("Enter new value (or press Enter to skip): ").strip()
                     
                     if new_value:
-                        updated_data[field_name]["value"] = new_value
                         # Mark manually edited fields with 100% confidence
-                        updated_data[field_name]["confidence"] = 100
+                        updated_data[field_name] = {**updated_data[field_name],
+                                                    "value": new_value, "confidence": 100}
                         print(f"✓ Updated '{field_name}' to '{new_value}'")
                     else:
                         print("⊘ Skipped (no change)")
@@ -145,16 +273,21 @@ class FieldReviewer:
                 print("❌ Please enter a valid number")
                 continue
         
+        self._edits_applied = True
         return updated_data
     
-    @staticmethod
-    def get_output_format() -> Optional[str]:
+    def get_output_format(self) -> Optional[str]:
         """
         Ask user to select output format.
         
         Returns:
             str: 'excel', 'json', 'csv', or None if cancelled
         """
+        decision = self._decision("format", _DEFAULT_FORMAT)
+        if decision is not _ASK:
+            print(f"✓ Selected: {decision or 'no save'}")
+            return decision
+        
         print("\n" + "="*80)
         print("📁 SELECT OUTPUT FORMAT")
         print("="*80)
@@ -183,8 +316,7 @@ class FieldReviewer:
             else:
                 print("❌ Invalid choice. Please enter 1, 2, 3, or 0")
     
-    @staticmethod
-    def get_output_filename(default_name: str = "scanned_form") -> str:
+    def get_output_filename(self, default_name: str = "scanned_form") -> str:
         """
         Ask user for custom filename.
         
@@ -195,7 +327,10 @@ class FieldReviewer:
             str: Filename (without extension - will be added by saver)
         """
         print(f"\nDefault filename: {default_name}")
-        custom_name = input("Enter custom filename (or press Enter for default): ").strip()
+        custom_name = self._decision("filename", "")
+        if custom_name is _ASK:
+            custom_name = input("Enter custom filename (or press Enter for default): ")
+        custom_name = (custom_name or "").strip()
         
         if custom_name:
             # Remove any file extension if provided
@@ -5,19 +5,90 @@ Supported formats: Excel (.xlsx), JSON (.json), CSV (.csv)
 Only saves after explicit user confirmation.
 """
 
+import importlib.util
+import io
 import json
 import csv
+import logging
 import os
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Dict
 
+# openpyxl is only imported by the first Excel save (see _excel_api), so
+# JSON/CSV runs never pay for it; this only checks that it is installed
+OPENPYXL_AVAILABLE = importlib.util.find_spec("openpyxl") is not None
+
 try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+logger = logging.getLogger(__name__)
+
+
+# Write buffer for JSON/CSV exports (Python's default is 8 KiB); keeps the
+# number of write syscalls low on network and cloud-synced volumes
+_WRITE_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+
+def _json_default(obj):
+    """
+    json.dumps hook for NumPy values, matching orjson's OPT_SERIALIZE_NUMPY.
+    
+    Args:
+        obj: Value the stdlib encoder could not serialize
+    
+    Returns:
+        Equivalent Python scalar or list
+    """
+    import numpy as np
+    
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps_json(data) -> bytes:
+    """Serialize to indented UTF-8 JSON, with orjson's C encoder when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(data, indent=2, ensure_ascii=False,
+                      default=_json_default).encode("utf-8")
+
+
+@lru_cache(maxsize=None)
+def _excel_api():
+    """
+    Import openpyxl (once) and build the Excel styles shared by every sheet.
+    
+    Returns:
+        SimpleNamespace: Workbook, WriteOnlyCell, get_column_letter and styles
+    """
     from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
     from openpyxl.styles import Font, PatternFill, Alignment
-    OPENPYXL_AVAILABLE = True
-except ImportError:
-    OPENPYXL_AVAILABLE = False
+    from openpyxl.utils import get_column_letter
+    
+    return SimpleNamespace(
+        Workbook=Workbook,
+        WriteOnlyCell=WriteOnlyCell,
+        get_column_letter=get_column_letter,
+        TITLE_FONT=Font(bold=True, size=14),
+        TIMESTAMP_FONT=Font(italic=True, size=10),
+        HEADER_FONT=Font(bold=True, color="FFFFFF"),
+        HEADER_FILL=PatternFill(start_color="1F4E78", end_color="1F4E78", fill_type="solid"),
+        HEADER_ALIGNMENT=Alignment(horizontal="center", vertical="center", wrap_text=True),
+        VALUE_ALIGNMENT=Alignment(horizontal="left", vertical="center", wrap_text=True),
+        CONFIDENCE_FONT=Font(italic=True),
+        CONFIDENCE_ALIGNMENT=Alignment(horizontal="center"),
+    )
 
 
 class DataSaver:
@@ -32,8 +103,10 @@ class DataSaver:
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Time of the most recent save (stamped again by every save() call,
+        # so one saver can be shared across documents)
         self.timestamp = datetime.now()
-        print(f"✓ Output directory: {self.output_dir}")
+        logger.info("✓ Output directory: %s", self.output_dir)
     
     def save(self, extracted_data: Dict, filename: str, format_type: str) -> bool:
         """
@@ -48,18 +121,35 @@ class DataSaver:
             bool: True if save successful, False otherwise
         """
         format_type = format_type.lower().strip()
+        timestamp = self.timestamp = datetime.now()
         
         if format_type == "excel":
-            return self._save_excel(extracted_data, filename)
+            return self._save_excel(extracted_data, filename, timestamp)
         elif format_type == "json":
-            return self._save_json(extracted_data, filename)
+            return self._save_json(extracted_data, filename, timestamp)
         elif format_type == "csv":
-            return self._save_csv(extracted_data, filename)
+            return self._save_csv(extracted_data, filename, timestamp)
         else:
-            print(f"❌ ERROR: Unknown format: {format_type}")
+            logger.error("❌ ERROR: Unknown format: %s", format_type)
             return False
     
-    def _save_excel(self, extracted_data: Dict, filename: str) -> bool:
+    @staticmethod
+    def _field_items(extracted_data: Dict):
+        """
+        Flatten extracted fields into (name, value, confidence) tuples, sorted by name.
+        
+        Args:
+            extracted_data (dict): Extracted fields
+        
+        Returns:
+            list: [(field_name, value, confidence), ...]
+        """
+        return sorted(
+            (field_name, field_data.get("value", ""), field_data.get("confidence", 0))
+            for field_name, field_data in extracted_data.items()
+        )
+    
+    def _save_excel(self, extracted_data: Dict, filename: str, timestamp: datetime) -> bool:
         """
         Save data as Excel file (.xlsx).
         
@@ -72,75 +162,83 @@ class DataSaver:
         Args:
             extracted_data (dict): Extracted fields
             filename (str): Base filename
+            timestamp (datetime): Save time written into the file
         
         Returns:
             bool: Success status
         """
         if not OPENPYXL_AVAILABLE:
-            print("❌ ERROR: openpyxl not installed")
-            print("   Install with: pip install openpyxl")
+            logger.error("❌ ERROR: openpyxl not installed")
+            logger.error("   Install with: pip install openpyxl")
             return False
         
         try:
-            workbook = Workbook()
-            sheet = workbook.active
-            sheet.title = "Scanned Data"
+            xl = _excel_api()
             
-            # Add metadata
-            sheet["A1"] = "Scanned Form Data"
-            sheet["A1"].font = Font(bold=True, size=14)
-            sheet.merge_cells("A1:D1")
+            # Write-only workbook: rows are streamed out as they are appended
+            workbook = xl.Workbook(write_only=True)
+            sheet = workbook.create_sheet("Scanned Data")
+            
+            items = self._field_items(extracted_data)
             
-            sheet["A2"] = f"Timestamp: {self.timestamp.strftime('%Y-%m-%d %H:%M:%S')}"
-            sheet["A2"].font = Font(italic=True, size=10)
-            sheet.merge_cells("A2:D2")
+            # Auto-adjust column widths (must be set before rows are written)
+            for col_idx, (field_name, _, _) in enumerate(items, 1):
+                column_letter = xl.get_column_letter(col_idx)
+                sheet.column_dimensions[column_letter].width = max(18, len(field_name) + 3)
+            
+            def styled(value, font=None, fill=None, alignment=None):
+                cell = xl.WriteOnlyCell(sheet, value=value)
+                if font is not None:
+                    cell.font = font
+                if fill is not None:
+                    cell.fill = fill
+                if alignment is not None:
+                    cell.alignment = alignment
+                return cell
             
-            sheet["A3"] = ""  # Blank row
+            # Add metadata
+            sheet.append([styled("Scanned Form Data", font=xl.TITLE_FONT)])
+            sheet.append([styled(
+                f"Timestamp: {timestamp.strftime('%Y-%m-%d %H:%M:%S')}",
+                font=xl.TIMESTAMP_FONT
+            )])
+            sheet.merged_cells.add("A1:D1")
+            sheet.merged_cells.add("A2:D2")
+            sheet.append([""])  # Blank row
             
             # Create header row with field names
-            field_names = sorted(extracted_data.keys())
-            for col_idx, field_name in enumerate(field_names, 1):
-                cell = sheet.cell(row=4, column=col_idx)
-                cell.value = field_name
-                cell.font = Font(bold=True, color="FFFFFF")
-                cell.fill = PatternFill(start_color="1F4E78", end_color="1F4E78", fill_type="solid")
-                cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+            sheet.append([
+                styled(field_name, font=xl.HEADER_FONT, fill=xl.HEADER_FILL,
+                       alignment=xl.HEADER_ALIGNMENT)
+                for field_name, _, _ in items
+            ])
             
             # Add data row
-            for col_idx, field_name in enumerate(field_names, 1):
-                cell = sheet.cell(row=5, column=col_idx)
-                value = extracted_data[field_name].get("value", "")
-                confidence = extracted_data[field_name].get("confidence", 0)
-                
-                cell.value = value
-                cell.alignment = Alignment(horizontal="left", vertical="center", wrap_text=True)
+            sheet.append([
+                styled(value, alignment=xl.VALUE_ALIGNMENT)
+                for _, value, _ in items
+            ])
             
-            # Add confidence row
-            sheet.cell(row=6, column=1).value = "Confidence (%)"
-            sheet.cell(row=6, column=1).font = Font(italic=True)
-            for col_idx, field_name in enumerate(field_names, 1):
-                cell = sheet.cell(row=6, column=col_idx)
-                confidence = extracted_data[field_name].get("confidence", 0)
-                cell.value = confidence
-                cell.alignment = Alignment(horizontal="center")
-            
-            # Auto-adjust column widths
-            for col_idx, field_name in enumerate(field_names, 1):
-                column_letter = sheet.cell(row=4, column=col_idx).column_letter
-                sheet.column_dimensions[column_letter].width = max(18, len(field_name) + 3)
+            # Add confidence row (the first score sits in the label column)
+            confidence_row = [
+                styled(confidence, alignment=xl.CONFIDENCE_ALIGNMENT)
+                for _, _, confidence in items
+            ] or [styled("Confidence (%)")]
+            confidence_row[0].font = xl.CONFIDENCE_FONT
+            sheet.append(confidence_row)
             
             # Save file
             filepath = self.output_dir / f"{filename}.xlsx"
             workbook.save(filepath)
             
-            print(f"✓ Excel file saved: {filepath}")
+            logger.debug("✓ Excel file saved: %s", filepath)
             return True
             
         except Exception as e:
-            print(f"❌ ERROR saving Excel file: {e}")
+            logger.error("❌ ERROR saving Excel file: %s", e)
             return False
     
-    def _save_json(self, extracted_data: Dict, filename: str) -> bool:
+    def _save_json(self, extracted_data: Dict, filename: str, timestamp: datetime) -> bool:
         """
         Save data as JSON file (.json).
         
@@ -159,29 +257,30 @@ class DataSaver:
         Args:
             extracted_data (dict): Extracted fields
             filename (str): Base filename
+            timestamp (datetime): Save time written into the file
         
         Returns:
             bool: Success status
         """
         try:
             data = {
-                "timestamp": self.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+                "timestamp": timestamp.strftime("%Y-%m-%d %H:%M:%S"),
                 "extracted_fields": extracted_data,
             }
             
             filepath = self.output_dir / f"{filename}.json"
             
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            with open(filepath, "wb", buffering=_WRITE_BUFFER_SIZE) as f:
+                f.write(_dumps_json(data))
             
-            print(f"✓ JSON file saved: {filepath}")
+            logger.debug("✓ JSON file saved: %s", filepath)
             return True
             
         except Exception as e:
-            print(f"❌ ERROR saving JSON file: {e}")
+            logger.error("❌ ERROR saving JSON file: %s", e)
             return False
     
-    def _save_csv(self, extracted_data: Dict, filename: str) -> bool:
+    def _save_csv(self, extracted_data: Dict, filename: str, timestamp: datetime) -> bool:
         """
         Save data as CSV file (.csv).
         
@@ -194,6 +293,7 @@ class DataSaver:
         Args:
             extracted_data (dict): Extracted fields
             filename (str): Base filename
+            timestamp (datetime): Save time written into the file
         
         Returns:
             bool: Success status
@@ -201,48 +301,42 @@ class DataSaver:
         try:
             filepath = self.output_dir / f"{filename}.csv"
             
-            field_names = sorted(extracted_data.keys())
+            items = self._field_items(extracted_data)
+            field_names = [field_name for field_name, _, _ in items]
+            values = [value for _, value, _ in items]
+            confidence_values = [confidence for _, _, confidence in items]
             
             # Calculate average confidence
-            confidence_values = [
-                extracted_data[fn].get("confidence", 0) 
-                for fn in field_names
-            ]
             avg_confidence = sum(confidence_values) / len(confidence_values) if confidence_values else 0
             
-            with open(filepath, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                
-                # Write timestamp
-                writer.writerow(["Timestamp", self.timestamp.strftime("%Y-%m-%d %H:%M:%S")])
-                writer.writerow([])  # Blank row
-                
-                # Write header
-                writer.writerow(["Field"] + field_names)
-                
-                # Write values
-                value_row = ["Value"]
-                for field_name in field_names:
-                    value = extracted_data[field_name].get("value", "")
-                    value_row.append(value)
-                writer.writerow(value_row)
-                
-                # Write confidence
-                confidence_row = ["Confidence (%)"]
-                for field_name in field_names:
-                    confidence = extracted_data[field_name].get("confidence", 0)
-                    confidence_row.append(str(confidence))
-                writer.writerow(confidence_row)
-                
-                # Write average confidence
-                writer.writerow([])  # Blank row
-                writer.writerow(["Average Confidence", f"{avg_confidence:.1f}%"])
+            rows = [
+                # Timestamp
+                ["Timestamp", timestamp.strftime("%Y-%m-%d %H:%M:%S")],
+                [],  # Blank row
+                # Header
+                ["Field"] + field_names,
+                # Values
+                ["Value"] + values,
+                # Confidence
+                ["Confidence (%)"] + [str(c) for c in confidence_values],
+                # Average confidence
+                [],  # Blank row
+                ["Average Confidence", f"{avg_confidence:.1f}%"],
+            ]
+            
+            # Quote all rows in memory, then hand the file one string
+            buffer = io.StringIO(newline="")
+            csv.writer(buffer).writerows(rows)
+            
+            with open(filepath, "w", newline="", encoding="utf-8",
+                      buffering=_WRITE_BUFFER_SIZE) as f:
+                f.write(buffer.getvalue())
             
-            print(f"✓ CSV file saved: {filepath}")
+            logger.debug("✓ CSV file saved: %s", filepath)
             return True
             
         except Exception as e:
-            print(f"❌ ERROR saving CSV file: {e}")
+            logger.error("❌ ERROR saving CSV file: %s", e)
             return False
     
     def list_output_files(self) -> None: